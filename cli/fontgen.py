@@ -9,32 +9,210 @@ import os
 import sys
 from pathlib import Path
 import subprocess
+import shutil
 import tempfile
-from PIL import Image, ImageDraw, ImageFont, ImageEnhance
+from PIL import Image, ImageDraw, ImageFont, ImageStat
 import json
 import html
+import copy
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+# Potrace flags tuned for font creation
+POTRACE_ARGS = (
+    '-s',  # SVG output
+    '--tight',  # Remove whitespace
+    '--turnpolicy', 'minority',  # Better for text
+    '--alphamax', '1.0',  # Smoother curves
+    '--opttolerance', '0.2'  # Optimize paths
+)
+
+
+def _binarize(gray, contrast, threshold):
+    """Contrast-enhance and threshold a grayscale image in a single LUT pass"""
+    # ImageEnhance.Contrast blends each pixel with the rounded image mean,
+    # so the enhanced value only depends on the input level and both steps
+    # fold into one 256-entry lookup table applied in C
+    mean = int(ImageStat.Stat(gray).mean[0] + 0.5)
+    lut = []
+    for level in range(256):
+        enhanced = int(min(max(mean + contrast * (level - mean), 0), 255))
+        lut.append(0 if enhanced < threshold else 255)
+    return gray.point(lut, '1')
+
+
+def _preprocess_tile(gray, pbm_path, border_crop, contrast, threshold):
+    """Binarize one grayscale character tile and save it as PBM"""
+    # Crop out border area to remove template box lines
+    width, height = gray.size
+    if width > border_crop*2 and height > border_crop*2:
+        gray = gray.crop((border_crop, border_crop, 
+                        width-border_crop, height-border_crop))
+    
+    # Enhance contrast significantly, then apply aggressive threshold
+    # for clean black/white
+    bw_img = _binarize(gray, contrast, threshold)
+    
+    # Save as raw P4 PBM (potrace's preferred input). P4 stores 1 for black,
+    # which is Pillow's inverted 1-bit packing, so write it without the encoder
+    with open(pbm_path, 'wb') as f:
+        f.write(b"P4\n%d %d\n" % bw_img.size)
+        f.write(bw_img.tobytes('raw', '1;I'))
+
+
+def _preprocess_image(char_file, processed_dir, potrace_params):
+    """Binarize one character image file and save it as PBM. Returns an error message or None"""
+    try:
+        with Image.open(char_file) as img:
+            # Convert to grayscale
+            gray = img.convert('L')
+            _preprocess_tile(gray, processed_dir / f"{char_file.stem}.pbm", *potrace_params)
+        return None
+    except Exception as e:
+        return f"Warning: Could not preprocess {char_file.name}: {e}"
+
+
+def _run_potrace(pbm_path, svg_path, args=POTRACE_ARGS, potrace='potrace'):
+    """Trace a single PBM file. Returns (name, ok, stderr)"""
+    try:
+        # Only stderr is ever reported, and only when the trace fails.
+        # An absolute potrace path with close_fds=False lets subprocess use
+        # posix_spawn instead of fork+exec; pipes are non-inheritable anyway
+        result = subprocess.run([potrace, str(pbm_path), '-o', str(svg_path), *args],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                close_fds=False)
+    except Exception as e:
+        return pbm_path.name, False, str(e)
+    if result.returncode == 0 and svg_path.exists():
+        return pbm_path.name, True, ''
+    return pbm_path.name, False, result.stderr.decode(errors='replace')
+
+
+def _run_potrace_batch(pbm_files, svg_dir, args=POTRACE_ARGS, potrace='potrace'):
+    """Trace several PBM files with one potrace process. Returns a list of (name, ok, stderr)"""
+    if not pbm_files:
+        return []
+    
+    # Without -o potrace writes <stem>.svg next to each input file
+    try:
+        result = subprocess.run([potrace, *args, *map(str, pbm_files)],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                close_fds=False)
+        batch_error = result.stderr.decode(errors='replace') if result.returncode != 0 else None
+    except Exception as e:
+        batch_error = str(e)
+    
+    results = []
+    for pbm_file in pbm_files:
+        traced = pbm_file.with_suffix('.svg')
+        svg_path = svg_dir / traced.name
+        if traced.exists():
+            os.replace(traced, svg_path)
+            results.append((pbm_file.name, True, ''))
+        elif batch_error is not None:
+            # Batch aborted part-way through; retry this file on its own
+            results.append(_run_potrace(pbm_file, svg_path, args, potrace))
+        else:
+            results.append((pbm_file.name, False, 'no output produced'))
+    return results
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(path, stamp):
+    """Parse a JSON config file, cached per path and file stamp"""
+    # stamp is only part of the cache key, so editing the file invalidates it.
+    # json.loads detects the encoding of raw bytes itself, so skip the text layer
+    return json.loads(Path(path).read_bytes())
+
+
+def _load_config(path):
+    """Return a private copy of the parsed config at path
+
+    The stamp includes the inode and size as well as mtime_ns, so an
+    os.replace within one coarse mtime tick still invalidates the cache.
+    Callers get a deep copy, so mutating one config never leaks into the
+    cached parse shared by the rest of the (long-lived worker) process.
+    """
+    st = os.stat(path)
+    stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+    return copy.deepcopy(_load_config_cached(path, stamp))
+
+
+def _split_chunks(items, count):
+    """Split items into at most count interleaved, non-empty chunks"""
+    count = max(1, min(count or 1, len(items)))
+    return [items[i::count] for i in range(count)]
+
+
+def _trace_tile_chunk(tiles, pbm_dir, svg_dir, potrace_params, potrace='potrace'):
+    """Binarize a chunk of tiles and trace them with one potrace call"""
+    errors = []
+    pbm_files = []
+    for char, tile in tiles:
+        pbm_path = pbm_dir / f"{ord(char):04d}.pbm"
+        try:
+            _preprocess_tile(tile, pbm_path, *potrace_params)
+            pbm_files.append(pbm_path)
+        except Exception as e:
+            errors.append(f"Warning: Could not preprocess '{char}': {e}")
+    return errors, _run_potrace_batch(pbm_files, svg_dir, potrace=potrace)
+
 
 class FontGeneratorPotrace:
-    def __init__(self, character_overrides_path=None):
-        # Load configuration
-        self.config = self.load_config()
+    def __init__(self, character_overrides_path=None, config_path=None, temp_dir='temp_files'):
+        # Load configuration (config.json in the working directory by default)
+        self.config = self.load_config(config_path)
+        
+        # Intermediate files (character images, PBMs, SVGs, scripts) go here
+        self.temp_dir = Path(temp_dir)
         
         # Load character overrides if provided
         self.character_overrides = {}
         if character_overrides_path:
             self.character_overrides = self.load_character_overrides(character_overrides_path)
         
+        # Resolve the external tools once so every launch uses an absolute
+        # executable path instead of searching PATH again
+        self.potrace_path = shutil.which('potrace') or 'potrace'
+        self.fontforge_path = shutil.which('fontforge') or 'fontforge'
+        
+        font_generation = self.config['font_generation']
+        
         # Template settings
-        template_settings = self.config['font_generation']['template_settings']
+        template_settings = font_generation['template_settings']
         self.template_size = template_settings['template_size']
         self.grid_cols = template_settings['grid_cols']
         self.margin = template_settings['margin']
+        self._cell = self.template_size + self.margin
+        
+        # Potrace preprocessing settings
+        potrace_settings = font_generation['potrace_settings']
+        self.border_crop = potrace_settings['border_crop']
+        self.contrast_enhancement = potrace_settings['contrast_enhancement']
+        self.threshold = potrace_settings['threshold']
+        
+        # Glyph metrics
+        glyph_settings = font_generation['glyph_settings']
+        self.glyph_width = glyph_settings['width']
+        self.left_bearing = glyph_settings['left_bearing']
+        self.right_bearing = glyph_settings['right_bearing']
+        self.space_width = glyph_settings['space_width']
+        
+        # Font properties, with optional vertical metrics
+        font_props = font_generation['font_properties']
+        self.em_units = font_props['em_units']
+        self.ascent = font_props['ascent']
+        self.descent = font_props['descent']
+        self.typo_ascent = font_props.get('typo_ascent', self.ascent)
+        self.typo_descent = font_props.get('typo_descent', -self.descent)
+        self.typo_line_gap = font_props.get('typo_line_gap', 0)
+        self.line_gap = font_props.get('line_gap', 0)
         
         # Build character list with their properties
         self.characters = []
         self.char_properties = {}
         
-        char_sets = self.config['font_generation']['character_sets']
+        char_sets = font_generation['character_sets']
         for set_name, set_data in char_sets.items():
             for char in set_data['characters']:
                 self.characters.append(char)
@@ -65,26 +243,32 @@ class FontGeneratorPotrace:
                     print(f"Applied overrides for '{char}': {overrides}")
                 
                 self.char_properties[char] = properties
+        
+        # Top-left corner of each character box, shared by the template
+        # and the extraction steps
+        rows = (len(self.characters) + self.grid_cols - 1) // self.grid_cols
+        self._positions = [(col * self._cell + self.margin, row * self._cell + self.margin + 50)
+                           for row in range(rows)
+                           for col in range(self.grid_cols)][:len(self.characters)]
     
-    def load_config(self):
-        """Load configuration from config.json"""
+    def load_config(self, config_path=None):
+        """Load configuration from config_path (default: config.json)"""
+        config_path = os.path.abspath(config_path or 'config.json')
         try:
-            with open('config.json', 'r') as f:
-                return json.load(f)
+            return _load_config(config_path)
         except FileNotFoundError:
-            print("❌ config.json not found. Using default settings.")
+            print(f"❌ {config_path} not found. Using default settings.")
             return self.get_default_config()
         except json.JSONDecodeError as e:
-            print(f"❌ Error parsing config.json: {e}. Using default settings.")
+            print(f"❌ Error parsing {config_path}: {e}. Using default settings.")
             return self.get_default_config()
     
     def load_character_overrides(self, overrides_path):
         """Load character-specific overrides from JSON file"""
         try:
-            with open(overrides_path, 'r') as f:
-                overrides = json.load(f)
-                print(f"✅ Loaded character overrides from {overrides_path}")
-                return overrides
+            overrides = json.loads(Path(overrides_path).read_bytes())
+            print(f"✅ Loaded character overrides from {overrides_path}")
+            return overrides
         except FileNotFoundError:
             print(f"⚠️ Character overrides file not found: {overrides_path}")
             return {}
@@ -109,14 +293,14 @@ class FontGeneratorPotrace:
             }
         }
     
-    def generate_template_svg(self, output_path):
-        """Generate SVG template with boxes for each character"""
+    def _template_svg_parts(self):
+        """Yield the SVG template document piece by piece"""
         rows = (len(self.characters) + self.grid_cols - 1) // self.grid_cols
         
-        width = self.grid_cols * (self.template_size + self.margin) + self.margin
-        height = rows * (self.template_size + self.margin) + self.margin + 50
+        width = self.grid_cols * self._cell + self.margin
+        height = rows * self._cell + self.margin + 50
         
-        svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>
+        yield f'''<?xml version="1.0" encoding="UTF-8"?>
 <svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">
     <style>
         .char-label {{ font-family: Arial; font-size: 16px; text-anchor: middle; }}
@@ -127,41 +311,38 @@ class FontGeneratorPotrace:
     <text x="{width//2}" y="30" class="title">Font Template - Draw your characters in the boxes below</text>
 '''
         
-        for i, char in enumerate(self.characters):
-            row = i // self.grid_cols
-            col = i % self.grid_cols
-            
-            x = col * (self.template_size + self.margin) + self.margin
-            y = row * (self.template_size + self.margin) + self.margin + 50
-            
-            svg_content += f'    <rect x="{x}" y="{y}" width="{self.template_size}" height="{self.template_size}" class="char-box"/>\n'
-            
-            label_x = x + self.template_size // 2
-            label_y = y - 5
-            escaped_char = html.escape(char)
-            svg_content += f'    <text x="{label_x}" y="{label_y}" class="char-label">{escaped_char}</text>\n'
-        
-        svg_content += '</svg>'
-        
+        # Boxes and labels share their styling through one group each, so the
+        # per-element markup is only coordinates (fill/stroke/font are inherited)
+        size = self.template_size
+        half = size // 2
+        yield '    <g class="char-box">\n'
+        yield ''.join(f'        <rect x="{x}" y="{y}" width="{size}" height="{size}"/>\n'
+                      for x, y in self._positions)
+        yield '    </g>\n    <g class="char-label">\n'
+        yield ''.join(f'        <text x="{x + half}" y="{y - 5}">{html.escape(char)}</text>\n'
+                      for char, (x, y) in zip(self.characters, self._positions))
+        yield '    </g>\n'
+        
+        yield '</svg>'
+    
+    def generate_template_svg(self, output_path):
+        """Generate SVG template with boxes for each character"""
         with open(output_path, 'w') as f:
-            f.write(svg_content)
+            f.writelines(self._template_svg_parts())
         
         print(f"Template created: {output_path}")
     
     def generate_template_png(self, output_path):
         """Generate PNG template with boxes for each character"""
-        # First generate SVG template
-        svg_path = output_path.replace('.png', '.svg')
-        self.generate_template_svg(svg_path)
-        
-        # Then convert to PNG
-        self.svg_to_png(svg_path, output_path)
-        
-        # Clean up temporary SVG file
+        # Render the SVG template from memory, no temporary SVG file needed
+        svg_bytes = ''.join(self._template_svg_parts()).encode('utf-8')
         try:
-            os.remove(svg_path)
-        except:
-            pass
+            import cairosvg
+            cairosvg.svg2png(bytestring=svg_bytes, write_to=output_path, dpi=300)
+            print(f"PNG version created: {output_path}")
+            print("This PNG version is optimized for Procreate import!")
+        except ImportError:
+            print("cairosvg not available. Use --format svg to generate an SVG template instead.")
     
     def svg_to_png(self, svg_path, png_path):
         """Convert SVG template to PNG for better Procreate compatibility"""
@@ -181,65 +362,100 @@ class FontGeneratorPotrace:
             print(f"Error opening image: {e}")
             return False
         
-        char_dir = Path(f"temp_files/{font_name}_characters")
+        char_dir = self.temp_dir / f"{font_name}_characters"
         char_dir.mkdir(parents=True, exist_ok=True)
         
-        rows = (len(self.characters) + self.grid_cols - 1) // self.grid_cols
-        
-        for i, char in enumerate(self.characters):
-            row = i // self.grid_cols
-            col = i % self.grid_cols
-            
-            x = col * (self.template_size + self.margin) + self.margin
-            y = row * (self.template_size + self.margin) + self.margin + 50
-            
-            char_img = img.crop((x, y, x + self.template_size, y + self.template_size))
+        # Reuse one tile-sized buffer for every character instead of
+        # allocating a new image per crop
+        size = self.template_size
+        char_img = Image.new('RGB', (size, size))
+        for char, (x, y) in zip(self.characters, self._positions):
+            if x + size > img.width or y + size > img.height:
+                # Match crop(): areas outside the template come out black
+                char_img.paste((0, 0, 0), (0, 0, size, size))
+            char_img.paste(img, (-x, -y))
             
             char_path = char_dir / f"{ord(char):04d}.png"
-            char_img.save(char_path)
+            char_img.save(char_path, compress_level=1)
         
         print(f"Character images extracted to: {char_dir}")
         return str(char_dir)
     
-    def preprocess_for_potrace(self, char_dir):
-        """Preprocess character images for optimal potrace results"""
+    def _potrace_params(self):
+        """Return (border_crop, contrast, threshold) from the potrace settings"""
+        return self.border_crop, self.contrast_enhancement, self.threshold
+    
+    def _character_files(self, directory, suffix):
+        """List the per-character files in directory, in character order"""
+        # Filenames are fully determined by the character list, so one
+        # directory read is enough to check which of them exist
+        directory = Path(directory)
+        present = set(os.listdir(directory))
+        names = (f"{ord(char):04d}{suffix}" for char in self.characters)
+        return [directory / name for name in names if name in present]
+    
+    def extract_character_tiles(self, image_path):
+        """Extract grayscale character tiles from filled template without writing them to disk"""
+        try:
+            with Image.open(image_path) as img:
+                # Let decoders that support it (JPEG) produce grayscale directly,
+                # so no full-size RGB buffer is built just to be converted
+                img.draft('L', img.size)
+                gray = img.convert('L')
+        except Exception as e:
+            print(f"Error opening image: {e}")
+            return None
+        
+        size = self.template_size
+        tiles = [(char, gray.crop((x, y, x + size, y + size)))
+                 for char, (x, y) in zip(self.characters, self._positions)]
+        
+        print(f"Extracted {len(tiles)} character tiles")
+        return tiles
+    
+    def preprocess_tiles_for_potrace(self, tiles, font_name):
+        """Preprocess in-memory character tiles for potrace"""
         print("🔧 Preprocessing images for potrace...")
         
-        processed_dir = Path(f"temp_files/{Path(char_dir).name}_potrace")
+        processed_dir = self.temp_dir / f"{font_name}_characters_potrace"
         processed_dir.mkdir(parents=True, exist_ok=True)
         
-        char_files = list(Path(char_dir).glob("*.png"))
+        potrace_params = self._potrace_params()
         
-        for char_file in char_files:
+        def process(item):
+            char, tile = item
             try:
-                with Image.open(char_file) as img:
-                    # Convert to grayscale
-                    gray = img.convert('L')
-                    
-                    # Get settings from config
-                    potrace_settings = self.config['font_generation']['potrace_settings']
-                    
-                    # Crop out border area to remove template box lines
-                    width, height = gray.size
-                    border_crop = potrace_settings['border_crop']
-                    if width > border_crop*2 and height > border_crop*2:
-                        gray = gray.crop((border_crop, border_crop, 
-                                        width-border_crop, height-border_crop))
-                    
-                    # Enhance contrast significantly
-                    enhancer = ImageEnhance.Contrast(gray)
-                    high_contrast = enhancer.enhance(potrace_settings['contrast_enhancement'])
-                    
-                    # Apply aggressive threshold for clean black/white
-                    threshold = potrace_settings['threshold']
-                    bw_img = high_contrast.point(lambda x: 0 if x < threshold else 255, '1')
-                    
-                    # Save as PBM format (potrace's preferred input)
-                    pbm_path = processed_dir / f"{char_file.stem}.pbm"
-                    bw_img.save(pbm_path)
-                    
+                _preprocess_tile(tile, processed_dir / f"{ord(char):04d}.pbm", *potrace_params)
+                return None
             except Exception as e:
-                print(f"Warning: Could not preprocess {char_file.name}: {e}")
+                return f"Warning: Could not preprocess '{char}': {e}"
+        
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for error in executor.map(process, tiles):
+                if error:
+                    print(error)
+        
+        print(f"✅ Preprocessed {len(tiles)} images for potrace")
+        return str(processed_dir)
+    
+    def preprocess_for_potrace(self, char_dir):
+        """Preprocess character images for optimal potrace results"""
+        print("🔧 Preprocessing images for potrace...")
+        
+        processed_dir = self.temp_dir / f"{Path(char_dir).name}_potrace"
+        processed_dir.mkdir(parents=True, exist_ok=True)
+        
+        char_files = self._character_files(char_dir, '.png')
+        potrace_params = self._potrace_params()
+        
+        # Pillow releases the GIL during image operations, so threads are enough
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            errors = executor.map(
+                lambda char_file: _preprocess_image(char_file, processed_dir, potrace_params),
+                char_files)
+            for error in errors:
+                if error:
+                    print(error)
         
         print(f"✅ Preprocessed {len(char_files)} images for potrace")
         return str(processed_dir)
@@ -248,35 +464,56 @@ class FontGeneratorPotrace:
         """Convert PBM files to SVG using potrace"""
         print("🎨 Converting bitmaps to vectors with potrace...")
         
-        svg_dir = Path(f"temp_files/{Path(pbm_dir).name}_svg")
+        svg_dir = self.temp_dir / f"{Path(pbm_dir).name}_svg"
         svg_dir.mkdir(parents=True, exist_ok=True)
         
-        pbm_files = list(Path(pbm_dir).glob("*.pbm"))
+        pbm_files = self._character_files(pbm_dir, '.pbm')
         successful_conversions = 0
         
-        for pbm_file in pbm_files:
-            try:
-                svg_output = svg_dir / f"{pbm_file.stem}.svg"
-                
-                # Run potrace with optimized settings for font creation
-                result = subprocess.run([
-                    'potrace',
-                    str(pbm_file),
-                    '-s',  # SVG output
-                    '-o', str(svg_output),
-                    '--tight',  # Remove whitespace
-                    '--turnpolicy', 'minority',  # Better for text
-                    '--alphamax', '1.0',  # Smoother curves
-                    '--opttolerance', '0.2'  # Optimize paths
-                ], capture_output=True, text=True)
-                
-                if result.returncode == 0 and svg_output.exists():
-                    successful_conversions += 1
-                else:
-                    print(f"Potrace failed for {pbm_file.name}: {result.stderr}")
-                    
-            except Exception as e:
-                print(f"Error processing {pbm_file.name}: {e}")
+        # One batched potrace call per worker amortizes process startup across glyphs
+        chunks = _split_chunks(pbm_files, os.cpu_count())
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            batches = executor.map(
+                lambda chunk: _run_potrace_batch(chunk, svg_dir, potrace=self.potrace_path),
+                chunks)
+            for results in batches:
+                for name, ok, stderr in results:
+                    if ok:
+                        successful_conversions += 1
+                    else:
+                        print(f"Potrace failed for {name}: {stderr}")
+        
+        print(f"✅ Potrace converted {successful_conversions} characters to SVG")
+        return str(svg_dir) if successful_conversions > 0 else None
+    
+    def trace_tiles_with_potrace(self, tiles, font_name):
+        """Preprocess and trace in-memory tiles, one pipelined chunk per worker"""
+        print("🎨 Preprocessing and tracing characters with potrace...")
+        
+        pbm_dir = self.temp_dir / f"{font_name}_characters_potrace"
+        svg_dir = self.temp_dir / f"{pbm_dir.name}_svg"
+        pbm_dir.mkdir(parents=True, exist_ok=True)
+        svg_dir.mkdir(parents=True, exist_ok=True)
+        
+        potrace_params = self._potrace_params()
+        successful_conversions = 0
+        
+        # Each worker binarizes its tiles and traces them right away, so a
+        # glyph goes from tile to SVG without waiting on the whole set
+        chunks = _split_chunks(tiles, os.cpu_count())
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            outcomes = executor.map(
+                lambda chunk: _trace_tile_chunk(chunk, pbm_dir, svg_dir, potrace_params,
+                                                self.potrace_path),
+                chunks)
+            for errors, results in outcomes:
+                for error in errors:
+                    print(error)
+                for name, ok, stderr in results:
+                    if ok:
+                        successful_conversions += 1
+                    else:
+                        print(f"Potrace failed for {name}: {stderr}")
         
         print(f"✅ Potrace converted {successful_conversions} characters to SVG")
         return str(svg_dir) if successful_conversions > 0 else None
@@ -356,9 +593,26 @@ class FontGeneratorPotrace:
     def create_fontforge_script_with_svg(self, svg_dir, font_name):
         """Create FontForge script that imports SVG files with character-specific scaling"""
         
-        # Get configuration values
-        font_props = self.config['font_generation']['font_properties']
-        glyph_settings = self.config['font_generation']['glyph_settings']
+        # Unroll the glyph loop at generation time: every glyph with an SVG
+        # becomes one add_glyph call with its values inlined as literals.
+        # Scale then position each glyph with one precomposed psMat matrix:
+        # X=75 for left margin, Y calculated from baseline (0) - baseline_offset.
+        # Lower baseline_offset values = higher position (toward ascenders),
+        # higher baseline_offset values = lower position (toward descenders)
+        svg_names = set(os.listdir(svg_dir))
+        glyph_calls = []
+        for char, props in self.char_properties.items():
+            unicode_val = ord(char)
+            svg_name = f"{unicode_val:04d}.svg"
+            if svg_name not in svg_names:
+                continue
+            scale_factor = props['scale_factor']
+            matrix = (scale_factor, 0, 0, scale_factor, 75, 0 - props['baseline_offset'])
+            svg_path = os.path.join(str(svg_dir), svg_name)
+            glyph_calls.append(
+                f"successful_chars += add_glyph({unicode_val}, {char!r}, {props['set']!r}, "
+                f"{scale_factor!r}, {svg_path!r}, {matrix!r})")
+        glyph_calls = '\n'.join(glyph_calls)
         
         script_content = f'''#!/usr/bin/env fontforge
 
@@ -366,6 +620,8 @@ import fontforge
 import os
 import sys
 
+IMPORT_FLAGS = ("removeoverlap", "correctdir")
+
 # Create new font
 font = fontforge.font()
 font.fontname = "{font_name}"
@@ -373,72 +629,61 @@ font.familyname = "{font_name}"
 font.fullname = "{font_name}"
 
 # Set font properties from config
-font.em = {font_props['em_units']}
-font.ascent = {font_props['ascent']}
-font.descent = {font_props['descent']}
-font.os2_typoascent = {font_props.get('typo_ascent', font_props['ascent'])}
-font.os2_typodescent = {font_props.get('typo_descent', -font_props['descent'])}
-font.os2_typolinegap = {font_props.get('typo_line_gap', 0)}
-font.hhea_linegap = {font_props.get('line_gap', 0)}
-
-# Character properties mapping
-char_properties = {self.char_properties!r}
+font.em = {self.em_units}
+font.ascent = {self.ascent}
+font.descent = {self.descent}
+font.os2_typoascent = {self.typo_ascent}
+font.os2_typodescent = {self.typo_descent}
+font.os2_typolinegap = {self.typo_line_gap}
+font.hhea_linegap = {self.line_gap}
 
 successful_chars = 0
-svg_dir = "{svg_dir}"
 
-for char, props in char_properties.items():
-    unicode_val = ord(char)
-    svg_path = os.path.join(svg_dir, f"{{unicode_val:04d}}.svg")
-    
-    if os.path.exists(svg_path):
+def add_glyph(unicode_val, char, char_set, scale_factor, svg_path, matrix):
+    """Import one SVG glyph; returns 1 on success and 0 on failure"""
+    try:
+        print(f"Processing '{{char}}' ({{char_set}}) from SVG...")
+        
+        # Create glyph
+        glyph = font.createChar(unicode_val)
+        
+        # Import SVG (much better than bitmap!)
+        glyph.importOutlines(svg_path, IMPORT_FLAGS)
+        
+        # Scale and position using the character-specific matrix
+        glyph.transform(matrix)
+        
+        # Clean up paths and remove any border artifacts
+        glyph.removeOverlap()
+        glyph.simplify(1.0, ("setstarttoextremum", "removesingletonpoints"))
+        glyph.round()
+        
+        # Set metrics from config
+        glyph.width = {self.glyph_width}
+        glyph.left_side_bearing = {self.left_bearing}
+        glyph.right_side_bearing = {self.right_bearing}
+        
+        print(f"  ✅ Successfully vectorized '{{char}}' (scale: {{scale_factor}}x)")
+        return 1
+        
+    except Exception as e:
+        print(f"  ❌ Error with '{{char}}': {{e}}")
+        # Create fallback empty glyph
         try:
-            print(f"Processing '{{char}}' ({{props['set']}}) from SVG...")
-            
-            # Create glyph
             glyph = font.createChar(unicode_val)
-            
-            # Import SVG (much better than bitmap!)
-            glyph.importOutlines(svg_path, ("removeoverlap", "correctdir"))
-            
-            # Scale and position using character-specific settings
-            scale_factor = props['scale_factor']
-            baseline_offset = props['baseline_offset']
-            
-            glyph.transform(psMat.scale(scale_factor, scale_factor))
-            # Position character properly relative to font baseline
-            # X=75 for left margin, Y calculated from baseline (0) - baseline_offset
-            # Lower baseline_offset values = higher position (toward ascenders)
-            # Higher baseline_offset values = lower position (toward descenders)
-            y_position = 0 - baseline_offset  # Invert: smaller offset = higher position
-            glyph.transform(psMat.translate(75, y_position))
-            
-            # Clean up paths and remove any border artifacts
-            glyph.removeOverlap()
-            glyph.simplify(1.0, ("setstarttoextremum", "removesingletonpoints"))
-            glyph.round()
-            
-            # Set metrics from config
-            glyph.width = {glyph_settings['width']}
-            glyph.left_side_bearing = {glyph_settings['left_bearing']}
-            glyph.right_side_bearing = {glyph_settings['right_bearing']}
-            
-            successful_chars += 1
-            print(f"  ✅ Successfully vectorized '{{char}}' (scale: {{scale_factor}}x)")
-            
-        except Exception as e:
-            print(f"  ❌ Error with '{{char}}': {{e}}")
-            # Create fallback empty glyph
-            try:
-                glyph = font.createChar(unicode_val)
-                glyph.width = {glyph_settings['width']}
-            except:
-                pass
+            glyph.width = {self.glyph_width}
+        except:
+            pass
+        return 0
+
+# One call per entry in char_properties that has an SVG,
+# with scale_factor and baseline offset folded into the matrix
+{glyph_calls}
 
 # Add space character
 try:
     space_glyph = font.createChar(32)
-    space_glyph.width = {glyph_settings['space_width']}
+    space_glyph.width = {self.space_width}
     print("Added space character")
 except:
     pass
@@ -468,34 +713,38 @@ if os.path.exists(output_path):
         print("⚠️  Font file is small but may work")
 '''
         
-        script_path = f"temp_files/{font_name}_potrace_script.py"
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        script_path = str(self.temp_dir / f"{font_name}_potrace_script.py")
         with open(script_path, 'w') as f:
             f.write(script_content)
         
         return script_path
     
-    def generate_font_with_potrace(self, image_path, font_name, enable_svg_positioning=False):
+    def generate_font_with_potrace(self, image_path, font_name, enable_svg_positioning=False,
+                                   debug_tiles=False):
         """Main function to generate TTF font using potrace pipeline"""
         print(f"🚀 Generating TTF font with potrace: '{font_name}'")
         
         # Check if FontForge is available
         try:
-            subprocess.run(['fontforge', '--version'], capture_output=True, check=True)
+            subprocess.run([self.fontforge_path, '--version'], capture_output=True, check=True,
+                           close_fds=False)
         except (subprocess.CalledProcessError, FileNotFoundError):
             print("❌ FontForge is required but not found!")
             print("Install with: brew install fontforge")
             return False
         
-        # Step 1: Extract character images
-        char_dir = self.extract_characters_from_image(image_path, font_name)
-        if not char_dir:
+        # Step 1: Extract character tiles in memory
+        tiles = self.extract_character_tiles(image_path)
+        if not tiles:
             return False
         
-        # Step 2: Preprocess for potrace
-        pbm_dir = self.preprocess_for_potrace(char_dir)
+        # Only write the character PNGs when they are needed for debugging
+        if debug_tiles:
+            self.extract_characters_from_image(image_path, font_name)
         
-        # Step 3: Convert to SVG with potrace
-        svg_dir = self.potrace_to_svg(pbm_dir)
+        # Steps 2-3: Preprocess and convert to SVG with potrace
+        svg_dir = self.trace_tiles_with_potrace(tiles, font_name)
         if not svg_dir:
             print("❌ Potrace conversion failed")
             return False
@@ -509,8 +758,9 @@ if os.path.exists(output_path):
         # Step 5: Run FontForge
         try:
             print("🔨 Running FontForge with potrace vectors...")
-            result = subprocess.run(['fontforge', '-script', script_path], 
-                                  capture_output=True, text=True, timeout=300)
+            result = subprocess.run([self.fontforge_path, '-script', script_path], 
+                                  capture_output=True, text=True, timeout=300,
+                                  close_fds=False)
             
             print("FontForge output:")
             if result.stdout:
@@ -539,7 +789,7 @@ if os.path.exists(output_path):
             print(f"❌ Error running FontForge: {e}")
             return False
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description='FontGen with Potrace - Better TTF generation')
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
@@ -561,8 +811,10 @@ def main():
                            help='Path to JSON file with character-specific overrides')
     font_parser.add_argument('--enable-svg-positioning', action='store_true',
                            help='Enable SVG positioning adjustment for special characters (experimental)')
+    font_parser.add_argument('--debug-tiles', action='store_true',
+                           help='Also save the extracted character images as PNG for debugging')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     if not args.command:
         parser.print_help()
@@ -592,7 +844,8 @@ def main():
             print(f"Error: Image file '{args.image}' not found")
             return
         
-        success = fontgen.generate_font_with_potrace(args.image, args.name, args.enable_svg_positioning)
+        success = fontgen.generate_font_with_potrace(args.image, args.name, args.enable_svg_positioning,
+                                                     args.debug_tiles)
         if not success:
             print("\n💡 If potrace TTF generation failed, you can still use:")
             print("   python simple_font_generator.py generate [image] --name [name]")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Long-lived FontGen worker used by the web UI
+Reads one JSON request per line on stdin ({"args": [...], "capture": bool}),
+runs the CLI in-process and answers with one JSON line holding returncode,
+stdout (the last lines only, and only when captured) and stderr
+"""
+
+import collections
+import contextlib
+import io
+import json
+import os
+import sys
+
+import fontgen
+
+# Lines of stdout kept when a caller asks for the output
+OUTPUT_TAIL_LINES = 1000
+
+
+class TailBuffer(io.TextIOBase):
+    """Text sink that keeps only the last max_lines lines written to it"""
+    
+    def __init__(self, max_lines=OUTPUT_TAIL_LINES):
+        self.lines = collections.deque(maxlen=max_lines)
+        self.partial = ''
+    
+    def write(self, text):
+        lines = (self.partial + text).split('\n')
+        self.partial = lines.pop()
+        self.lines.extend(line + '\n' for line in lines)
+        return len(text)
+    
+    def getvalue(self):
+        return ''.join(self.lines) + self.partial
+
+
+def run_command(args, capture=False):
+    """Run one CLI command in-process; stdout is discarded unless captured"""
+    stdout = TailBuffer() if capture else open(os.devnull, 'w')
+    stderr = io.StringIO()
+    returncode = 0
+    
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            fontgen.main(args)
+        except SystemExit as e:
+            # argparse errors and failed generations exit through sys.exit
+            if e.code is None or isinstance(e.code, int):
+                returncode = e.code or 0
+            else:
+                print(e.code, file=sys.stderr)
+                returncode = 1
+        except Exception as e:
+            print(f"❌ {type(e).__name__}: {e}", file=sys.stderr)
+            returncode = 1
+    
+    if not capture:
+        stdout.close()
+    return {"returncode": returncode,
+            "stdout": stdout.getvalue() if capture else "",
+            "stderr": stderr.getvalue()}
+
+
+def main():
+    # argparse messages should name the CLI script, not this worker
+    sys.argv[0] = 'fontgen.py'
+    
+    # Answer on a private copy of stdout and point fd 1 at stderr, so output
+    # from child processes can never interleave with the protocol stream
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), 'w', encoding='utf-8')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        response = run_command(request["args"], request.get("capture", False))
+        protocol.write(json.dumps(response) + "\n")
+        protocol.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -9,11 +9,14 @@ import tempfile
 import subprocess
 import sys
 import json
-from pathlib import Path
+import functools
+import shutil
 
 # Try to import PIL, but make it optional
 try:
     from PIL import Image, ImageDraw
+    # Register all format plugins up front instead of on the first open()
+    Image.init()
     PIL_AVAILABLE = True
 except ImportError:
     PIL_AVAILABLE = False
@@ -26,13 +29,55 @@ sys.path.insert(0, cli_dir)
 
 from fontgen import FontGeneratorPotrace
 
+# Resolve the external tools once per test run
+_FONTFORGE = shutil.which('fontforge') or 'fontforge'
+_POTRACE = shutil.which('potrace') or 'potrace'
+
+@functools.lru_cache(maxsize=None)
+def _probe(bin_name):
+    """Run `<bin_name> --version` once per test run; returns (returncode, stdout, stderr)"""
+    result = subprocess.run([bin_name, '--version'], capture_output=True, text=True, timeout=10,
+                            close_fds=False)
+    return result.returncode, result.stdout, result.stderr
+
+def _scan_file(path, needles, chunk_size=65536):
+    """Return the subset of byte needles found in a file, reading it in chunks"""
+    found = set()
+    # Keep the end of the previous chunk so matches across chunk boundaries are seen
+    overlap = max(map(len, needles)) - 1
+    tail = b''
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            window = tail + chunk
+            for needle in needles:
+                if needle not in found and needle in window:
+                    found.add(needle)
+            if len(found) == len(needles):
+                break
+            tail = window[-overlap:] if overlap else b''
+    return found
+
+def _count(directory, ext):
+    """Count the files in a directory with the given extension"""
+    with os.scandir(directory) as entries:
+        return sum(1 for e in entries if e.name.endswith(ext))
+
 class TestFontGen(unittest.TestCase):
     
-    def setUp(self):
-        """Set up test fixtures"""
-        # Create a temporary config for testing
-        self.test_dir = tempfile.mkdtemp()
-        self.config_path = os.path.join(self.test_dir, "config.json")
+    # Template artifacts shared across tests, built lazily on first use
+    _cached_svg = None
+    _cached_png = None
+    _cached_chars = None
+    _cached_pbm = None
+    
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by every test"""
+        # Create a temporary config for testing; the directory is removed
+        # as a whole when the class finishes
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.test_dir = cls._tmp.name
+        cls.config_path = os.path.join(cls.test_dir, "config.json")
         
         # Create test config
         test_config = {
@@ -78,47 +123,80 @@ class TestFontGen(unittest.TestCase):
             }
         }
         
-        with open(self.config_path, 'w') as f:
+        # Write config.json once in the test directory
+        with open(cls.config_path, 'w') as f:
             json.dump(test_config, f)
         
-        # Create main config.json in test directory
-        main_config_path = os.path.join(self.test_dir, "config.json")
-        with open(main_config_path, 'w') as f:
-            json.dump(test_config, f)
-        
-        # Change to test directory so config is found
-        self.original_cwd = os.getcwd()
-        os.chdir(self.test_dir)
-        
-        self.fontgen = FontGeneratorPotrace()
+        # Tests only read from the generator, so they share one instance;
+        # config and intermediate files are passed explicitly instead of via chdir
+        cls.fontgen = FontGeneratorPotrace(config_path=cls.config_path,
+                                           temp_dir=os.path.join(cls.test_dir, "temp_files"))
         
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up test files"""
-        import shutil
-        os.chdir(self.original_cwd)
-        shutil.rmtree(self.test_dir, ignore_errors=True)
-        
+        cls._tmp.cleanup()
+        
+    @classmethod
+    def _cached_template(cls):
+        """Return (svg_path, png_path) of a template generated once per class.
+        
+        The files are shared, so tests that modify them must copy them first.
+        """
+        if cls._cached_png is None:
+            svg_path = os.path.join(cls.test_dir, "cached_template.svg")
+            png_path = os.path.join(cls.test_dir, "cached_template.png")
+            cls.fontgen.generate_template_svg(svg_path)
+            cls._cached_svg = svg_path
+            cls.fontgen.svg_to_png(svg_path, png_path)
+            cls._cached_png = png_path
+        return cls._cached_svg, cls._cached_png
+    
+    @classmethod
+    def _cached_svg_template(cls):
+        """Return the shared SVG template path without rasterizing it"""
+        if cls._cached_svg is None:
+            svg_path = os.path.join(cls.test_dir, "cached_template.svg")
+            cls.fontgen.generate_template_svg(svg_path)
+            cls._cached_svg = svg_path
+        return cls._cached_svg
+    
+    @classmethod
+    def _cached_character_dir(cls):
+        """Return the shared directory of extracted character images"""
+        if cls._cached_chars is None:
+            _, png_path = cls._cached_template()
+            cls._cached_chars = cls.fontgen.extract_characters_from_image(png_path, "CachedTest")
+        return cls._cached_chars
+    
+    @classmethod
+    def _cached_pbm_dir(cls):
+        """Return the shared directory of preprocessed PBM files"""
+        if cls._cached_pbm is None:
+            # Built from in-memory tiles, so no per-character PNGs are written
+            _, png_path = cls._cached_template()
+            tiles = cls.fontgen.extract_character_tiles(png_path)
+            cls._cached_pbm = cls.fontgen.preprocess_tiles_for_potrace(tiles, "CachedTest")
+        return cls._cached_pbm
+    
     def test_fontforge_installation(self):
         """Test if FontForge is properly installed and working"""
         print("\n🔍 Testing FontForge installation...")
         
         try:
             # Test basic FontForge availability
-            result = subprocess.run(['fontforge', '--version'], 
-                                  capture_output=True, text=True, timeout=10)
+            returncode, stdout, _ = _probe(_FONTFORGE)
             
-            self.assertEqual(result.returncode, 0, 
+            self.assertEqual(returncode, 0, 
                            "FontForge is not installed or not working")
             
-            print(f"✅ FontForge version: {result.stdout.strip()}")
+            print(f"✅ FontForge version: {stdout.strip()}")
             
             # Check architecture (cross-platform)
             try:
-                # Try to find FontForge path
-                which_result = subprocess.run(['which', 'fontforge'], 
-                                           capture_output=True, text=True)
-                if which_result.returncode == 0:
-                    fontforge_path = which_result.stdout.strip()
+                # FontForge path resolved at import time
+                if os.path.isabs(_FONTFORGE):
+                    fontforge_path = _FONTFORGE
                     print(f"✅ FontForge found at: {fontforge_path}")
                     
                     # Check architecture if possible
@@ -147,13 +225,12 @@ class TestFontGen(unittest.TestCase):
         
         try:
             # Test basic Potrace availability
-            result = subprocess.run(['potrace', '--version'], 
-                                  capture_output=True, text=True, timeout=10)
+            returncode, stdout, _ = _probe(_POTRACE)
             
-            self.assertEqual(result.returncode, 0, 
+            self.assertEqual(returncode, 0, 
                            "Potrace is not installed or not working")
             
-            print(f"✅ Potrace version: {result.stdout.strip()}")
+            print(f"✅ Potrace version: {stdout.strip()}")
             
         except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired) as e:
             self.fail(f"Potrace test failed: {e}")
@@ -199,8 +276,9 @@ except Exception as e:
         
         try:
             output_font = os.path.join(self.test_dir, "test_font.ttf")
-            result = subprocess.run(['fontforge', '-script', test_script, output_font], 
-                                  capture_output=True, text=True, timeout=30)
+            result = subprocess.run([_FONTFORGE, '-script', test_script, output_font], 
+                                  capture_output=True, text=True, timeout=30,
+                                  close_fds=False)
             
             self.assertEqual(result.returncode, 0, 
                            f"FontForge scripting failed: {result.stderr}")
@@ -226,22 +304,23 @@ except Exception as e:
         """Test SVG template generation"""
         print("\n📐 Testing SVG template generation...")
         
-        svg_path = os.path.join(self.test_dir, "test_template.svg")
-        self.fontgen.generate_template_svg(svg_path)
+        svg_path = self._cached_svg_template()
         
         self.assertTrue(os.path.exists(svg_path), "SVG template not created")
         
-        # Check SVG content
-        with open(svg_path, 'r') as f:
-            content = f.read()
-            
-        self.assertIn('<svg', content, "Invalid SVG format")
-        self.assertIn('Font Template', content, "Template title missing")
-        self.assertIn('rect', content, "Character boxes missing")
-        
+        # Check SVG content in a single streaming pass
+        checks = {
+            b'<svg': "Invalid SVG format",
+            b'Font Template': "Template title missing",
+            b'rect': "Character boxes missing",
+        }
         # Check if test characters are present (we only have A,B,C,a,b,c,0,1,2 in test config)
         for char in ['A', 'a', '0']:
-            self.assertIn(f'>{char}<', content, f"Character {char} missing from template")
+            checks[f'>{char}<'.encode()] = f"Character {char} missing from template"
+        
+        found = _scan_file(svg_path, checks)
+        for needle, message in checks.items():
+            self.assertIn(needle, found, message)
         
         print("✅ SVG template generation works")
     
@@ -275,11 +354,7 @@ except Exception as e:
         print("\n🖼️  Testing PNG template generation...")
         
         # First generate SVG, then convert to PNG
-        svg_path = os.path.join(self.test_dir, "test_template.svg")
-        png_path = os.path.join(self.test_dir, "test_template.png")
-        
-        self.fontgen.generate_template_svg(svg_path)
-        self.fontgen.svg_to_png(svg_path, png_path)
+        _, png_path = self._cached_template()
         
         self.assertTrue(os.path.exists(png_path), "PNG template not created")
         
@@ -298,13 +373,8 @@ except Exception as e:
             
         print("\n✂️  Testing character extraction...")
         
-        # Create a mock filled template
-        svg_path = os.path.join(self.test_dir, "filled_template.svg")
-        test_image = os.path.join(self.test_dir, "filled_template.png")
-        
-        # Generate template first to get proper dimensions
-        self.fontgen.generate_template_svg(svg_path)
-        self.fontgen.svg_to_png(svg_path, test_image)
+        # Use the shared template as a mock filled template with proper dimensions
+        _, test_image = self._cached_template()
         
         # Test character extraction
         char_dir = self.fontgen.extract_characters_from_image(test_image, "TestFont")
@@ -312,12 +382,12 @@ except Exception as e:
         self.assertTrue(os.path.exists(char_dir), "Character directory not created")
         
         # Check if character images were extracted
-        char_files = list(Path(char_dir).glob("*.png"))
-        self.assertGreater(len(char_files), 5, "Too few characters extracted")
+        char_count = _count(char_dir, ".png")
+        self.assertGreater(char_count, 5, "Too few characters extracted")
         
         # Check a specific character file
-        a_char_file = Path(char_dir) / f"{ord('A'):04d}.png"
-        self.assertTrue(a_char_file.exists(), "Character 'A' not extracted")
+        a_char_file = os.path.join(char_dir, f"{ord('A'):04d}.png")
+        self.assertTrue(os.path.exists(a_char_file), "Character 'A' not extracted")
         
         # Verify character image properties
         with Image.open(a_char_file) as char_img:
@@ -325,7 +395,7 @@ except Exception as e:
                            (self.fontgen.template_size, self.fontgen.template_size),
                            "Character image wrong size")
         
-        print(f"✅ Character extraction works ({len(char_files)} characters)")
+        print(f"✅ Character extraction works ({char_count} characters)")
     
     def test_potrace_preprocessing(self):
         """Test potrace preprocessing pipeline"""
@@ -334,26 +404,55 @@ except Exception as e:
             
         print("\n🔧 Testing potrace preprocessing...")
         
-        # Create a mock filled template
-        svg_path = os.path.join(self.test_dir, "test_preprocessing.svg")
-        test_image = os.path.join(self.test_dir, "test_preprocessing.png")
-        self.fontgen.generate_template_svg(svg_path)
-        self.fontgen.svg_to_png(svg_path, test_image)
-        
-        # Test character extraction
-        char_dir = self.fontgen.extract_characters_from_image(test_image, "PotraceTes")
+        # Character images extracted from the shared template
+        char_dir = self._cached_character_dir()
         self.assertTrue(os.path.exists(char_dir), "Character directory not created")
         
-        # Test preprocessing for potrace
+        # Test preprocessing for potrace from the on-disk character images
         processed_dir = self.fontgen.preprocess_for_potrace(char_dir)
         self.assertTrue(os.path.exists(processed_dir), "Processed directory not created")
         
         # Check PBM files were created
-        pbm_files = list(Path(processed_dir).glob("*.pbm"))
-        self.assertGreater(len(pbm_files), 0, "No PBM files created")
+        pbm_count = _count(processed_dir, ".pbm")
+        self.assertGreater(pbm_count, 0, "No PBM files created")
         
-        print(f"✅ Potrace preprocessing created {len(pbm_files)} PBM files")
-    
+        print(f"✅ Potrace preprocessing created {pbm_count} PBM files")
+
+    def test_in_memory_tile_preprocessing(self):
+        """Test in-memory tile extraction matches the on-disk preprocessing pipeline"""
+        if not PIL_AVAILABLE:
+            self.skipTest("PIL not available, skipping tile preprocessing test")
+
+        print("\n🧩 Testing in-memory tile preprocessing...")
+
+        # Draw a mock filled template directly so cairo is not required
+        fg = self.fontgen
+        cell = fg.template_size + fg.margin
+        rows = (len(fg.characters) + fg.grid_cols - 1) // fg.grid_cols
+        test_image = os.path.join(self.test_dir, "tiles_template.png")
+        img = Image.new('RGB', (fg.grid_cols * cell + fg.margin, rows * cell + fg.margin + 50), 'white')
+        draw = ImageDraw.Draw(img)
+        for i in range(len(fg.characters)):
+            x = (i % fg.grid_cols) * cell + fg.margin
+            y = (i // fg.grid_cols) * cell + fg.margin + 50
+            draw.rectangle((x + 30, y + 20, x + 60 + i, y + 80), fill=(40 + i * 10,) * 3)
+        img.save(test_image, compress_level=1)
+
+        tiles = fg.extract_character_tiles(test_image)
+        self.assertEqual([char for char, _ in tiles], fg.characters, "Tiles out of order")
+        for _, tile in tiles:
+            self.assertEqual(tile.size, (fg.template_size, fg.template_size), "Tile wrong size")
+
+        tile_dir = fg.preprocess_tiles_for_potrace(tiles, "TileTest")
+        disk_dir = fg.preprocess_for_potrace(fg.extract_characters_from_image(test_image, "DiskTest"))
+
+        for char in fg.characters:
+            name = f"{ord(char):04d}.pbm"
+            with Image.open(os.path.join(tile_dir, name)) as a, Image.open(os.path.join(disk_dir, name)) as b:
+                self.assertEqual(a.tobytes(), b.tobytes(), f"PBM mismatch for '{char}'")
+
+        print(f"✅ In-memory preprocessing matches disk pipeline for {len(tiles)} tiles")
+
     def test_potrace_conversion(self):
         """Test potrace bitmap-to-vector conversion"""
         if not PIL_AVAILABLE:
@@ -364,14 +463,8 @@ except Exception as e:
         if not self._check_potrace_available():
             self.skipTest("Potrace not available")
         
-        # Create test PBM files
-        svg_path = os.path.join(self.test_dir, "test_potrace.svg")
-        test_image = os.path.join(self.test_dir, "test_potrace.png")
-        self.fontgen.generate_template_svg(svg_path)
-        self.fontgen.svg_to_png(svg_path, test_image)
-        
-        char_dir = self.fontgen.extract_characters_from_image(test_image, "PotraceTest")
-        processed_dir = self.fontgen.preprocess_for_potrace(char_dir)
+        # Shared test PBM files
+        processed_dir = self._cached_pbm_dir()
         
         # Test potrace conversion
         svg_dir = self.fontgen.potrace_to_svg(processed_dir)
@@ -380,18 +473,17 @@ except Exception as e:
             self.assertTrue(os.path.exists(svg_dir), "SVG directory not created")
             
             # Check SVG files were created
-            svg_files = list(Path(svg_dir).glob("*.svg"))
-            self.assertGreater(len(svg_files), 0, "No SVG files created")
+            svg_count = _count(svg_dir, ".svg")
+            self.assertGreater(svg_count, 0, "No SVG files created")
             
-            print(f"✅ Potrace converted {len(svg_files)} files to SVG")
+            print(f"✅ Potrace converted {svg_count} files to SVG")
         else:
             print("⚠️  Potrace conversion failed (may be environment issue)")
     
     def _check_potrace_available(self):
         """Helper to check if potrace is available"""
         try:
-            subprocess.run(['potrace', '--version'], 
-                          capture_output=True, text=True, timeout=5)
+            _probe(_POTRACE)
             return True
         except:
             return False
@@ -404,18 +496,15 @@ except Exception as e:
         print("\n🔄 Testing end-to-end potrace workflow (without font generation)...")
         
         # Step 1: Generate template
-        svg_path = os.path.join(self.test_dir, "workflow_template.svg")
-        template_path = os.path.join(self.test_dir, "workflow_template.png")
-        self.fontgen.generate_template_svg(svg_path)
-        self.fontgen.svg_to_png(svg_path, template_path)
+        _, template_path = self._cached_template()
         self.assertTrue(os.path.exists(template_path))
         
-        # Step 2: Extract characters (simulating filled template)
-        char_dir = self.fontgen.extract_characters_from_image(template_path, "WorkflowTest")
-        self.assertTrue(os.path.exists(char_dir))
+        # Step 2: Extract characters in memory (simulating filled template)
+        tiles = self.fontgen.extract_character_tiles(template_path)
+        self.assertEqual(len(tiles), len(self.fontgen.characters))
         
-        # Step 3: Preprocess for potrace
-        processed_dir = self.fontgen.preprocess_for_potrace(char_dir)
+        # Step 3: Preprocess the extracted tiles for potrace
+        processed_dir = self.fontgen.preprocess_tiles_for_potrace(tiles, "WorkflowTest")
         self.assertTrue(os.path.exists(processed_dir))
         
         # Step 4: Test potrace conversion (if available)
@@ -458,11 +547,11 @@ except Exception as e:
         svg_time = time.time() - start_time
         
         # Time character extraction
+        # (the SVG generated above is rasterized rather than generated again;
+        # this test times generation itself, so it does not use the cache)
         start_time = time.time()
-        perf_svg = os.path.join(self.test_dir, "test_performance.svg")
         png_path = os.path.join(self.test_dir, "test_performance.png")
-        self.fontgen.generate_template_svg(perf_svg)
-        self.fontgen.svg_to_png(perf_svg, png_path)
+        self.fontgen.svg_to_png(template_path, png_path)
         char_dir = self.fontgen.extract_characters_from_image(png_path, "PerfTest")
         extraction_time = time.time() - start_time
         
@@ -473,6 +562,29 @@ except Exception as e:
         self.assertLess(svg_time, 5.0, "SVG generation too slow")
         self.assertLess(extraction_time, 10.0, "Character extraction too slow")
 
+class FastFirstLoader(unittest.TestLoader):
+    """Run quick sanity checks before the slower rendering and tracing tests"""
+    
+    _order = {
+        'test_config_loading': 0,
+        'test_svg_template_generation': 1,
+        'test_potrace_installation': 2,
+        'test_fontforge_installation': 3,
+        'test_in_memory_tile_preprocessing': 4,
+        'test_png_template_generation': 10,
+        'test_character_extraction': 11,
+        'test_potrace_preprocessing': 12,
+        'test_potrace_conversion': 13,
+        'test_fontforge_python_scripting': 20,
+        'test_end_to_end_workflow': 30,
+        'test_performance_check': 99,
+    }
+    
+    def sortTestMethodsUsing(self, a, b):
+        key_a = (self._order.get(a, 50), a)
+        key_b = (self._order.get(b, 50), b)
+        return (key_a > key_b) - (key_a < key_b)
+
 def run_system_info():
     """Print system information for debugging"""
     print("🖥️  System Information:")
@@ -521,5 +633,5 @@ if __name__ == '__main__':
     # Print system info first
     run_system_info()
     
-    # Run tests
-    unittest.main(verbosity=2, buffer=True)
\ No newline at end of file
+    # Run tests, cheapest first so --failfast stops before the slow ones
+    unittest.main(verbosity=2, buffer=True, testLoader=FastFirstLoader())
\ No newline at end of file
@@ -6,136 +6,245 @@ Runs all tests and provides a summary
 
 import os
 import sys
+import json
+import shutil
+import socket
 import subprocess
+import tempfile
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+# Directory holding this runner, resolved once
+_HERE = Path(__file__).resolve().parent
+
+# The test groups run in parallel, so each one prints its banner and its
+# report as single blocks
+_print_lock = threading.Lock()
+
+def _emit(lines):
+    """Print a block of report lines without interleaving with other groups"""
+    with _print_lock:
+        print("\n".join(lines), flush=True)
+
+def _run_test_script(script, cwd, timeout):
+    """Run a test script; returns (returncode, stdout, stderr)
+
+    Groups run side by side, so stdout is spooled to a temporary file and
+    handed back for the caller to print as one block; stderr is spooled the
+    same way and only read back when the script fails.
+    """
+    with tempfile.TemporaryFile(mode='w+') as output, tempfile.TemporaryFile(mode='w+') as errors:
+        result = subprocess.run([sys.executable, script], stdout=output, stderr=errors,
+                                text=True, timeout=timeout, cwd=cwd)
+        output.seek(0)
+        stdout = output.read().rstrip("\n")
+        if result.returncode == 0:
+            return 0, stdout, ""
+        errors.seek(0)
+        return result.returncode, stdout, errors.read()
+
 def run_cli_tests():
     """Run CLI tests"""
-    print("🖥️  Running CLI tests...")
-    print("=" * 40)
+    _emit(["🖥️  Running CLI tests...", "=" * 40])
+    out = []
     
     try:
-        # Change to CLI test directory
-        cli_test_dir = Path(__file__).parent / "cli"
-        os.chdir(cli_test_dir)
-        
-        # Run CLI tests
-        result = subprocess.run([
-            sys.executable, "test_fontgen.py"
-        ], capture_output=True, text=True, timeout=120)
+        # Run CLI tests from the CLI test directory
+        cli_test_dir = _HERE / "cli"
+        returncode, stdout, stderr = _run_test_script("test_fontgen.py", cli_test_dir, 120)
+        if stdout:
+            out.append(stdout)
         
-        if result.returncode == 0:
-            print("✅ CLI tests passed")
+        if returncode == 0:
+            out.append("✅ CLI tests passed")
             return True
         else:
-            print("❌ CLI tests failed")
-            if result.stderr:
-                print("Errors:")
-                print(result.stderr)
+            out.append("❌ CLI tests failed")
+            if stderr:
+                out.append("Errors:")
+                out.append(stderr)
             return False
             
     except subprocess.TimeoutExpired:
-        print("❌ CLI tests timed out")
+        out.append("❌ CLI tests timed out")
         return False
     except Exception as e:
-        print(f"❌ CLI tests error: {e}")
+        out.append(f"❌ CLI tests error: {e}")
         return False
+    finally:
+        if out:
+            _emit(out)
 
 def run_core_tests():
     """Run core functionality tests"""
-    print("\n🧪 Running core functionality tests...")
-    print("=" * 40)
+    _emit(["\n🧪 Running core functionality tests...", "=" * 40])
+    out = []
     
     try:
-        # Change to main test directory
-        test_dir = Path(__file__).parent
-        os.chdir(test_dir)
-        
-        # Run core tests
-        result = subprocess.run([
-            sys.executable, "test_core_functionality.py"
-        ], capture_output=True, text=True, timeout=60)
+        # Run core tests from the main test directory
+        test_dir = _HERE
+        returncode, stdout, stderr = _run_test_script("test_core_functionality.py", test_dir, 60)
+        if stdout:
+            out.append(stdout)
         
-        if result.returncode == 0:
-            print("✅ Core functionality tests passed")
+        if returncode == 0:
+            out.append("✅ Core functionality tests passed")
             return True
         else:
-            print("❌ Core functionality tests failed")
-            if result.stderr:
-                print("Errors:")
-                print(result.stderr)
+            out.append("❌ Core functionality tests failed")
+            if stderr:
+                out.append("Errors:")
+                out.append(stderr)
             return False
             
     except subprocess.TimeoutExpired:
-        print("❌ Core functionality tests timed out")
+        out.append("❌ Core functionality tests timed out")
         return False
     except Exception as e:
-        print(f"❌ Core functionality tests error: {e}")
+        out.append(f"❌ Core functionality tests error: {e}")
         return False
+    finally:
+        if out:
+            _emit(out)
+
+# Address the web tests expect the development server on
+WEB_SERVER = ('127.0.0.1', 8000)
+
+def _server_listening(address, timeout=0.05):
+    """Return True if something accepts TCP connections at address"""
+    with socket.socket() as sock:
+        sock.settimeout(timeout)
+        return sock.connect_ex(address) == 0
 
 def run_web_tests():
     """Run web UI tests (if server is available)"""
-    print("\n🌐 Running web UI tests...")
-    print("=" * 40)
+    _emit(["\n🌐 Running web UI tests...", "=" * 40])
+    out = []
+    
+    # Skip the child process entirely when no server is listening
+    if not _server_listening(WEB_SERVER):
+        _emit(["⚠️  Web server not running, skipping web UI tests"])
+        return None
     
     try:
-        # Change to web test directory
-        web_test_dir = Path(__file__).parent / "webapp"
-        os.chdir(web_test_dir)
-        
-        # Run web tests
-        result = subprocess.run([
-            sys.executable, "test_api.py"
-        ], capture_output=True, text=True, timeout=60)
+        # Run web tests from the web test directory
+        web_test_dir = _HERE / "webapp"
+        returncode, stdout, stderr = _run_test_script("test_api.py", web_test_dir, 60)
+        if stdout:
+            out.append(stdout)
         
-        if result.returncode == 0:
-            print("✅ Web UI tests passed")
+        if returncode == 0:
+            out.append("✅ Web UI tests passed")
             return True
         else:
-            print("⚠️  Web UI tests failed (expected if server not running)")
+            out.append("⚠️  Web UI tests failed (expected if server not running)")
             return False
             
     except subprocess.TimeoutExpired:
-        print("⚠️  Web UI tests timed out")
+        out.append("⚠️  Web UI tests timed out")
         return False
     except Exception as e:
-        print(f"⚠️  Web UI tests error: {e}")
+        out.append(f"⚠️  Web UI tests error: {e}")
         return False
+    finally:
+        if out:
+            _emit(out)
+
+# Python modules checked by a single interpreter launch; the probe prints
+# the ones that fail to import
+_PYTHON_MODULES = {'Python PIL': 'PIL', 'Python requests': 'requests'}
+_IMPORT_PROBE = """import importlib, sys
+for name in sys.argv[1:]:
+    try:
+        importlib.import_module(name)
+    except Exception:
+        print(name)
+"""
+
+def _probe(argv):
+    """Run one dependency probe; returns (icon, status, stdout)"""
+    try:
+        result = subprocess.run(argv, capture_output=True, text=True, timeout=10)
+    except FileNotFoundError:
+        return "❌", "Not installed", None
+    except subprocess.TimeoutExpired:
+        return "⚠️ ", "Timeout", None
+    except Exception as e:
+        return "❌", f"Error - {e}", None
+    if result.returncode != 0:
+        return "❌", "Not working", None
+    return "✅", "Available", result.stdout
+
+# Binary probe results, reused while the resolved executable is unchanged
+_PROBE_CACHE = _HERE / ".cache" / "_probe_cache.json"
+
+def _load_probe_cache():
+    """Load cached binary probe results (empty if missing or unreadable)"""
+    try:
+        return json.loads(_PROBE_CACHE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def _save_probe_cache(cache):
+    """Write binary probe results back for the next run"""
+    try:
+        _PROBE_CACHE.parent.mkdir(exist_ok=True)
+        _PROBE_CACHE.write_text(json.dumps(cache, indent=2))
+    except OSError:
+        pass
+
+def _probe_binary(argv, cache):
+    """Probe an external tool, skipping the launch if it is cached for this exact binary"""
+    path = shutil.which(argv[0])
+    if path is None:
+        return "❌", "Not installed", None
+    
+    stat = os.stat(path)
+    key = [path, stat.st_mtime_ns, stat.st_size]
+    entry = cache.get(argv[0])
+    if entry and entry['key'] == key:
+        return tuple(entry['outcome'])
+    
+    outcome = _probe([path, *argv[1:]])
+    # Timeouts and launch errors may be transient, so they are not cached
+    if outcome[1] in ("Available", "Not working"):
+        cache[argv[0]] = {'key': key, 'outcome': list(outcome)}
+    return outcome
 
 def check_dependencies():
     """Check if required dependencies are available"""
-    print("🔍 Checking dependencies...")
-    print("=" * 40)
+    out = ["🔍 Checking dependencies...", "=" * 40]
     
+    cache = _load_probe_cache()
     dependencies = {
-        'FontForge': 'fontforge --version',
-        'Potrace': 'potrace --version',
-        'Python PIL': f'{sys.executable} -c "from PIL import Image; print(\"PIL available\")"',
-        'Python requests': f'{sys.executable} -c "import requests; print(\"requests available\")"'
+        ('FontForge',): lambda: _probe_binary(['fontforge', '--version'], cache),
+        ('Potrace',): lambda: _probe_binary(['potrace', '--version'], cache),
+        # Installed modules can change without the interpreter changing,
+        # so the import check always runs
+        tuple(_PYTHON_MODULES): lambda: _probe(
+            [sys.executable, '-c', _IMPORT_PROBE, *_PYTHON_MODULES.values()]),
     }
     
+    # The probes are independent processes, so run them side by side
+    with ThreadPoolExecutor(max_workers=len(dependencies)) as executor:
+        outcomes = list(executor.map(lambda probe: probe(), dependencies.values()))
+    _save_probe_cache(cache)
+    
     results = {}
     
-    for name, command in dependencies.items():
-        try:
-            result = subprocess.run(command.split(), capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                print(f"✅ {name}: Available")
-                results[name] = True
-            else:
-                print(f"❌ {name}: Not working")
+    for names, (icon, status, stdout) in zip(dependencies, outcomes):
+        failed_imports = stdout.split() if stdout else []
+        for name in names:
+            if _PYTHON_MODULES.get(name) in failed_imports:
+                out.append(f"❌ {name}: Not installed")
                 results[name] = False
-        except FileNotFoundError:
-            print(f"❌ {name}: Not installed")
-            results[name] = False
-        except subprocess.TimeoutExpired:
-            print(f"⚠️  {name}: Timeout")
-            results[name] = False
-        except Exception as e:
-            print(f"❌ {name}: Error - {e}")
-            results[name] = False
+            else:
+                out.append(f"{icon} {name}: {status}")
+                results[name] = status == "Available"
     
+    _emit(out)
     return results
 
 def main():
@@ -143,13 +252,24 @@ def main():
     print("🧪 FontGen Comprehensive Test Suite")
     print("=" * 50)
     
-    # Check dependencies first
-    deps = check_dependencies()
+    # Check dependencies and run the test groups side by side; each one
+    # is a subprocess, so a thread per group is enough
+    groups = {
+        'deps': check_dependencies,
+        'cli': run_cli_tests,
+        'core': run_core_tests,
+        'web': run_web_tests,
+    }
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+        futures = {executor.submit(func): key for key, func in groups.items()}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
     
-    # Run tests
-    cli_result = run_cli_tests()
-    core_result = run_core_tests()
-    web_result = run_web_tests()
+    deps = results['deps']
+    cli_result = results['cli']
+    core_result = results['core']
+    web_result = results['web']
     
     # Summary
     print("\n" + "=" * 50)
@@ -9,18 +9,34 @@ import os
 import sys
 import tempfile
 import json
+import shutil
+import platform
+import copy
+import html
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Directory holding this test file, resolved once
+_HERE = Path(__file__).resolve().parent
+
 # Add paths for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'cli'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'web_app'))
+sys.path.append(str(_HERE.parent / 'cli'))
+sys.path.append(str(_HERE.parent / 'web_app'))
+
+def _generate_template(config_path, svg_path):
+    """Generate one SVG template from a config file (runs in a worker process)"""
+    from fontgen import FontGeneratorPotrace
+    FontGeneratorPotrace(config_path=config_path).generate_template_svg(svg_path)
+    return svg_path
 
 class TestCoreFunctionality(unittest.TestCase):
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.test_dir = tempfile.mkdtemp()
-        self.config_path = os.path.join(self.test_dir, "test_config.json")
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by every test"""
+        cls.test_dir = tempfile.mkdtemp()
+        cls.config_path = os.path.join(cls.test_dir, "test_config.json")
         
         # Create test config
         test_config = {
@@ -81,31 +97,28 @@ class TestCoreFunctionality(unittest.TestCase):
             }
         }
         
-        # Also create a main config.json in the test directory
-        main_config_path = os.path.join(self.test_dir, "config.json")
-        with open(main_config_path, 'w') as f:
-            json.dump(test_config, f)
-        
-        with open(self.config_path, 'w') as f:
-            json.dump(test_config, f)
+        # The generators get this path explicitly, so the working
+        # directory is left alone
+        Path(cls.config_path).write_text(json.dumps(test_config))
+        cls.test_config = test_config
         
-        # Change to test directory so config is found
-        self.original_cwd = os.getcwd()
-        os.chdir(self.test_dir)
+        # Build each generator once; the tests only read from them
+        from fontgen import FontGeneratorPotrace
+        from core.font_generator import FontGenerator
+        cls.cli_fontgen = FontGeneratorPotrace(config_path=cls.config_path)
+        cls.web_fontgen = FontGenerator(cls.config_path)
         
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up test files"""
-        import shutil
-        os.chdir(self.original_cwd)
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
     
     def test_cli_fontgen_import(self):
         """Test that CLI FontGenerator can be imported and initialized"""
         print("\n🧪 Testing CLI FontGenerator import...")
         
         try:
-            from fontgen import FontGeneratorPotrace
-            fontgen = FontGeneratorPotrace(self.config_path)
+            fontgen = self.cli_fontgen
             
             self.assertIsNotNone(fontgen.config)
             self.assertIsNotNone(fontgen.characters)
@@ -115,8 +128,6 @@ class TestCoreFunctionality(unittest.TestCase):
             print(f"   Characters loaded: {len(fontgen.characters)}")
             print(f"   Character properties: {len(fontgen.char_properties)}")
             
-        except ImportError as e:
-            self.fail(f"Failed to import CLI FontGenerator: {e}")
         except Exception as e:
             self.fail(f"Failed to initialize CLI FontGenerator: {e}")
     
@@ -125,8 +136,7 @@ class TestCoreFunctionality(unittest.TestCase):
         print("\n🧪 Testing Web FontGenerator import...")
         
         try:
-            from core.font_generator import FontGenerator
-            fontgen = FontGenerator(self.config_path)
+            fontgen = self.web_fontgen
             
             self.assertIsNotNone(fontgen.config)
             self.assertIsNotNone(fontgen.char_properties)
@@ -139,8 +149,6 @@ class TestCoreFunctionality(unittest.TestCase):
             print(f"   Characters loaded: {len(characters)}")
             print(f"   Character properties: {len(fontgen.char_properties)}")
             
-        except ImportError as e:
-            self.fail(f"Failed to import Web FontGenerator: {e}")
         except Exception as e:
             self.fail(f"Failed to initialize Web FontGenerator: {e}")
     
@@ -149,8 +157,7 @@ class TestCoreFunctionality(unittest.TestCase):
         print("\n🧪 Testing SVG positioning system...")
         
         try:
-            from fontgen import FontGeneratorPotrace
-            fontgen = FontGeneratorPotrace(self.config_path)
+            fontgen = self.cli_fontgen
             
             # Test that the method exists
             self.assertTrue(hasattr(fontgen, 'adjust_svg_positions'))
@@ -178,8 +185,7 @@ class TestCoreFunctionality(unittest.TestCase):
         print("\n🧪 Testing character positioning configuration...")
         
         try:
-            from fontgen import FontGeneratorPotrace
-            fontgen = FontGeneratorPotrace(self.config_path)
+            fontgen = self.cli_fontgen
             
             # Test that the config was loaded correctly
             self.assertIn('font_generation', fontgen.config)
@@ -217,8 +223,7 @@ class TestCoreFunctionality(unittest.TestCase):
         print("\n🧪 Testing template generation...")
         
         try:
-            from fontgen import FontGeneratorPotrace
-            fontgen = FontGeneratorPotrace(self.config_path)
+            fontgen = self.cli_fontgen
             
             # Test SVG template generation
             svg_path = os.path.join(self.test_dir, "test_template.svg")
@@ -238,6 +243,41 @@ class TestCoreFunctionality(unittest.TestCase):
             
         except Exception as e:
             self.fail(f"Template generation test failed: {e}")
+    
+    def test_template_generation_per_character_set(self):
+        """Test one template per character set, generated across processes"""
+        print("\n🧪 Testing per-character-set template generation...")
+        
+        # One config per character set, holding only that set
+        character_sets = self.test_config['font_generation']['character_sets']
+        jobs = []
+        for set_name, char_set in character_sets.items():
+            config = copy.deepcopy(self.test_config)
+            config['font_generation']['character_sets'] = {set_name: char_set}
+            config_path = os.path.join(self.test_dir, f"config_{set_name}.json")
+            Path(config_path).write_text(json.dumps(config))
+            jobs.append((config_path, os.path.join(self.test_dir, f"template_{set_name}.svg")))
+        
+        # Template generation is CPU-bound, so spread it over processes; a
+        # single template is not worth the pool start-up
+        config_paths, svg_paths = zip(*jobs)
+        if len(jobs) > 1:
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1),
+                                     mp_context=context) as executor:
+                results = list(executor.map(_generate_template, config_paths, svg_paths))
+        else:
+            results = [_generate_template(*jobs[0])]
+        
+        for (set_name, char_set), svg_path in zip(character_sets.items(), results):
+            content = Path(svg_path).read_text()
+            self.assertIn('<svg', content)
+            self.assertEqual(content.count('<rect '), len(char_set['characters']),
+                             f"Wrong number of boxes for {set_name}")
+            for char in char_set['characters']:
+                self.assertIn(f">{html.escape(char)}</text>", content)
+        
+        print(f"✅ Generated {len(results)} per-set templates")
 
 def run_system_info():
     """Print system information for debugging"""
@@ -246,7 +286,6 @@ def run_system_info():
     
     # System architecture
     try:
-        import platform
         print(f"Architecture: {platform.machine()}")
         print(f"Platform: {platform.platform()}")
     except:
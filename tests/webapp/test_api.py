@@ -5,18 +5,60 @@ Tests the main endpoints to identify issues
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import atexit
+import io
 import json
 import os
 import sys
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Try to import PIL, but make it optional
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# Directory holding this test file, resolved once
+_HERE = Path(__file__).resolve().parent
+
 # Test configuration
 BASE_URL = "http://127.0.0.1:8000"
 
+# One keep-alive session shared by every request to the test server
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=3))
+atexit.register(SESSION.close)
+
+class _ThreadOutput:
+    """stdout proxy that sends each worker thread's prints to its own buffer"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+    
+    def write(self, text):
+        return getattr(self.local, 'buffer', self.stream).write(text)
+    
+    def flush(self):
+        getattr(self.local, 'buffer', self.stream).flush()
+
+def _run_buffered(output, test):
+    """Run one test with its prints captured; returns (result, output)"""
+    output.local.buffer = io.StringIO()
+    try:
+        return test(), output.local.buffer.getvalue()
+    finally:
+        del output.local.buffer
+
 def test_server_running():
     """Test if the server is running"""
     try:
-        response = requests.get(f"{BASE_URL}/", timeout=5)
+        response = SESSION.get(f"{BASE_URL}/", timeout=5)
         if response.status_code == 200:
             print("✅ Server is running")
             return True
@@ -39,7 +81,7 @@ def test_template_generation():
             'filename': 'test_template'
         }
         
-        response = requests.post(f"{BASE_URL}/api/generate-template", data=data, timeout=30)
+        response = SESSION.post(f"{BASE_URL}/api/generate-template", data=data, timeout=30)
         
         print(f"Status Code: {response.status_code}")
         if response.status_code == 500:
@@ -72,7 +114,7 @@ def test_config_loading():
     print("\n🧪 Testing config loading...")
     
     try:
-        response = requests.get(f"{BASE_URL}/api/config", timeout=10)
+        response = SESSION.get(f"{BASE_URL}/api/config", timeout=10)
         
         if response.status_code == 200:
             config = response.json()
@@ -104,21 +146,18 @@ def test_file_upload():
     """Test file upload endpoint"""
     print("\n🧪 Testing file upload...")
     
-    # Create a dummy test image
-    test_image_path = "test_image.png"
+    if not PIL_AVAILABLE:
+        print("❌ File upload error: PIL not available")
+        return None
     
     try:
-        # Create a simple test PNG file
-        from PIL import Image
-        img = Image.new('RGB', (100, 100), color='white')
-        img.save(test_image_path)
-        
-        with open(test_image_path, 'rb') as f:
-            files = {'file': ('test_image.png', f, 'image/png')}
-            response = requests.post(f"{BASE_URL}/api/upload-image", files=files, timeout=30)
+        # Encode a simple test PNG in memory
+        buf = io.BytesIO()
+        Image.new('RGB', (100, 100), color='white').save(buf, format='PNG')
+        buf.seek(0)
         
-        # Clean up test file
-        os.remove(test_image_path)
+        files = {'file': ('test_image.png', buf, 'image/png')}
+        response = SESSION.post(f"{BASE_URL}/api/upload-image", files=files, timeout=30)
         
         if response.status_code == 200:
             result = response.json()
@@ -142,9 +181,6 @@ def test_file_upload():
             
     except Exception as e:
         print(f"❌ File upload error: {e}")
-        # Clean up test file if it exists
-        if os.path.exists(test_image_path):
-            os.remove(test_image_path)
         return None
 
 def test_fontgen_initialization():
@@ -153,11 +189,11 @@ def test_fontgen_initialization():
     
     try:
         # Import the FontGenerator class
-        sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "web_app"))
+        sys.path.append(str(_HERE.parents[1] / "web_app"))
         from core.font_generator import FontGenerator
         
         # Try to initialize with the config file
-        config_path = os.path.join("..", "..", "cli", "config.json")
+        config_path = str(_HERE.parents[1] / "cli" / "config.json")
         font_gen = FontGenerator(config_path)
         
         # Test basic functionality
@@ -181,8 +217,6 @@ def check_dependencies():
     """Check system dependencies"""
     print("\n🧪 Checking system dependencies...")
     
-    import subprocess
-    
     # Check FontForge
     try:
         result = subprocess.run(['fontforge', '--version'], capture_output=True, text=True)
@@ -204,7 +238,7 @@ def check_dependencies():
         print("❌ Potrace not installed")
     
     # Check config file
-    config_path = os.path.join("..", "..", "cli", "config.json")
+    config_path = str(_HERE.parents[1] / "cli" / "config.json")
     if os.path.exists(config_path):
         print("✅ Config file found")
     else:
@@ -225,10 +259,30 @@ def main():
         print("\n❌ Server is not running. Start it with: python web_app/run.py")
         return
     
-    # Run API tests
-    config_ok = test_config_loading()
-    template_ok = test_template_generation()
-    upload_path = test_file_upload()
+    # The API tests are independent requests, so run them side by side and
+    # print each one's output as a block in the usual order; every request
+    # carries its own timeout, so a hung server cannot stall the run
+    api_tests = {
+        'config': test_config_loading,
+        'template': test_template_generation,
+        'upload': test_file_upload,
+    }
+    results = {}
+    output = _ThreadOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=len(api_tests)) as executor:
+            futures = {key: executor.submit(_run_buffered, output, test)
+                       for key, test in api_tests.items()}
+            for key, future in futures.items():
+                results[key], text = future.result()
+                print(text, end='')
+    finally:
+        sys.stdout = output.stream
+    
+    config_ok = results['config']
+    template_ok = results['template']
+    upload_path = results['upload']
     
     # Summary
     print("\n" + "=" * 40)
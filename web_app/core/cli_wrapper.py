@@ -4,10 +4,198 @@ Calls the CLI backend instead of duplicating font generation logic
 """
 
 import os
+import re
+import asyncio
+import copy
+import hashlib
+import select
+import shutil
 import subprocess
+import threading
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, List
 
+# Patterns used to pull the viewBox and path data out of potrace SVGs
+_VIEWBOX_RE = re.compile(r'viewBox="([^"]*)"')
+_PATH_RE = re.compile(r'<path[^>]*d="([^"]*)"')
+
+# Safe filename names for characters that cannot appear in filenames (matches CLI logic)
+_CHAR_TO_NAME = {
+    '/': 'slash', '\\': 'backslash', ':': 'colon',
+    '*': 'asterisk', '?': 'question', '"': 'quote',
+    "'": 'apostrophe', '<': 'less', '>': 'greater',
+    '|': 'pipe', ' ': 'space'
+}
+
+# Reverse lookup; also accepts a few names only ever produced by older files
+_NAME_TO_CHAR = {
+    **{name: char for char, name in _CHAR_TO_NAME.items()},
+    'exclamation': '!', 'hash': '#', 'ampersand': '&', 'at': '@',
+    'percent': '%', 'backtick': '`', 'tilde': '~'
+}
+
+# Punctuation that is kept as-is in filenames
+_FILENAME_SAFE_PUNCTUATION = frozenset('-_.')
+
+_CHAR_CODE_RE = re.compile(r'char_(\d+)')
+
+# Character sets offered by the template generator; built once and shared,
+# so the character lists are tuples
+_CHARACTER_SETS = {
+    "English Basic": {
+        "uppercase": tuple("ABCDEFGHIJKLMNOPQRSTUVWXYZ"),
+        "lowercase": tuple("abcdefghijklmnopqrstuvwxyz"),
+        "numbers": tuple("0123456789"),
+        "symbols": ('!', '@', '#', '$', '%', '^', '&', '*', '(', ')', '-', '_', '=', '+', '[', ']', '{', '}', '|', '\\', ';', ':', '"', "'", '<', '>', ',', '.', '/', '?', '`', '~')
+    },
+    "Spanish Extensions": {
+        "spanish_accented": ('á', 'é', 'í', 'ó', 'ú', 'ü', 'ñ', 'Á', 'É', 'Í', 'Ó', 'Ú', 'Ü', 'Ñ', '¿', '¡')
+    }
+}
+
+# Below this many glyph SVGs a thread pool costs more than it saves
+_PARALLEL_READ_THRESHOLD = 16
+
+
+def _read_svg(path: str):
+    """Read one SVG file; returns its content or the exception raised"""
+    try:
+        # Potrace output is ASCII, so a binary read plus one decode skips the
+        # text-mode newline translation
+        with open(path, 'rb') as f:
+            return f.read().decode('utf-8')
+    except Exception as e:
+        return e
+
+
+# Rendered templates, keyed by the template-relevant config, CLI script
+# version and format; only the most recently used entries are kept
+_TEMPLATE_CACHE_DIR = os.path.join("temp_files", "template_cache")
+_TEMPLATE_CACHE_MAX_ENTRIES = 32
+
+
+def _prune_template_cache():
+    """Drop the least recently used template cache entries beyond the size cap"""
+    cached = []
+    try:
+        with os.scandir(_TEMPLATE_CACHE_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith('.tmp'):
+                    continue
+                try:
+                    cached.append((entry.stat().st_mtime_ns, entry.path))
+                except FileNotFoundError:
+                    continue
+    except FileNotFoundError:
+        return
+    if len(cached) > _TEMPLATE_CACHE_MAX_ENTRIES:
+        cached.sort()
+        for _, path in cached[:len(cached) - _TEMPLATE_CACHE_MAX_ENTRIES]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+# Directories with more entries than this are unlinked from a thread pool
+_PARALLEL_UNLINK_THRESHOLD = 50
+
+
+def _fast_rmtree(path: str):
+    """Remove a directory tree, unlinking large flat directories in parallel
+
+    Glyph SVG directories are flat and hold hundreds of files; the unlinks
+    are syscall-bound, so overlapping them beats shutil.rmtree's serial loop.
+    """
+    files = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                _fast_rmtree(entry.path)
+            else:
+                files.append(entry.path)
+    
+    if len(files) > _PARALLEL_UNLINK_THRESHOLD:
+        with ThreadPoolExecutor(max_workers=min(32, len(files))) as pool:
+            list(pool.map(os.unlink, files))
+    else:
+        for file_path in files:
+            os.unlink(file_path)
+    
+    os.rmdir(path)
+
+
+# Idle CLI workers kept per wrapper; extra ones are shut down on check-in
+_MAX_IDLE_WORKERS = 4
+
+# Lines of CLI stdout kept when a caller asks for the output
+_OUTPUT_TAIL_LINES = 1000
+
+
+def _run_with_tail(cmd: List[str], cwd: str, timeout: int):
+    """Run a command keeping only the tail of its stdout; returns (returncode, stdout, stderr)
+
+    Both pipes are drained by threads while the command runs, so a chatty
+    CLI can neither fill a pipe and stall nor grow an unbounded buffer.
+    """
+    stdout_tail = deque(maxlen=_OUTPUT_TAIL_LINES)
+    stderr_lines = []
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          text=True, cwd=cwd) as proc:
+        readers = [threading.Thread(target=stdout_tail.extend, args=(proc.stdout,), daemon=True),
+                   threading.Thread(target=stderr_lines.extend, args=(proc.stderr,), daemon=True)]
+        for reader in readers:
+            reader.start()
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            for reader in readers:
+                reader.join()
+    return proc.returncode, ''.join(stdout_tail), ''.join(stderr_lines)
+
+
+class _CLIWorker:
+    """A long-lived cli/fontgen_worker.py process answering one JSON line per request"""
+    
+    def __init__(self, python_cmd: str, cli_dir: str):
+        self.proc = subprocess.Popen(
+            [python_cmd, "fontgen_worker.py"],
+            cwd=cli_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8"
+        )
+    
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+    
+    def run(self, args: List[str], timeout: int, capture: bool = False) -> Dict:
+        """Send one command and wait for its JSON result line"""
+        self.proc.stdin.write(json.dumps({"args": args, "capture": capture}) + "\n")
+        self.proc.stdin.flush()
+        
+        ready, _, _ = select.select([self.proc.stdout], [], [], timeout)
+        if not ready:
+            self.close()
+            raise subprocess.TimeoutExpired(self.proc.args, timeout)
+        
+        line = self.proc.stdout.readline()
+        if not line:
+            raise RuntimeError(f"CLI worker exited with code {self.proc.wait()}")
+        return json.loads(line)
+    
+    def close(self):
+        """Stop the worker process"""
+        if self.alive():
+            self.proc.kill()
+        self.proc.wait()
+
 
 class CLIWrapper:
     """Wrapper around the CLI fontgen.py to avoid code duplication"""
@@ -22,11 +210,41 @@ class CLIWrapper:
         if not os.path.exists(self.cli_script):
             raise FileNotFoundError(f"CLI script not found at {self.cli_script}")
         
+        # Setup virtual environment if it exists
+        venv_python = os.path.join(self.cli_dir, "venv", "bin", "python")
+        if os.path.exists(venv_python):
+            self.python_cmd = venv_python
+        else:
+            # Try to use the main project's virtual environment
+            main_venv_python = os.path.join(web_app_dir, "..", "venv", "bin", "python")
+            if os.path.exists(main_venv_python):
+                self.python_cmd = main_venv_python
+            else:
+                self.python_cmd = "python"
+        
+        # Warm CLI worker processes, reused across commands; select() cannot
+        # wait on pipes on Windows, so there every command spawns the CLI.
+        # CLI_IN_PROCESS=0 forces the spawn-per-command path everywhere.
+        self._use_workers = os.name != 'nt' and os.environ.get('CLI_IN_PROCESS', '1') != '0'
+        self._idle_workers = []
+        self._workers_lock = threading.Lock()
+        
         # Load config for web UI features
+        self._config_stamp = None
         self.config = self._load_config()
+        self._scale_by_char = None
+    
+    def _config_file_stamp(self):
+        """Return a key that changes whenever config.json is rewritten"""
+        try:
+            st = os.stat(self.config_path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
     
     def _load_config(self) -> Dict:
         """Load configuration from CLI config.json"""
+        self._config_stamp = self._config_file_stamp()
         try:
             with open(self.config_path, 'r') as f:
                 return json.load(f)
@@ -34,55 +252,142 @@ class CLIWrapper:
             print(f"Error loading config: {e}")
             return {}
     
-    def _run_cli_command(self, args: List[str], timeout: int = 300) -> Dict:
-        """Run a CLI command and return the result"""
+    def _refresh_config(self):
+        """Re-read config.json if another process (or a hand edit) changed it"""
+        if self._config_file_stamp() != self._config_stamp:
+            self.config = self._load_config()
+            self._scale_by_char = None
+    
+    def _checkout_worker(self) -> _CLIWorker:
+        """Take an idle CLI worker, starting a new one if none is free"""
+        with self._workers_lock:
+            while self._idle_workers:
+                worker = self._idle_workers.pop()
+                if worker.alive():
+                    return worker
+        return _CLIWorker(self.python_cmd, self.cli_dir)
+    
+    def _checkin_worker(self, worker: _CLIWorker):
+        """Return a CLI worker to the idle pool"""
+        with self._workers_lock:
+            if len(self._idle_workers) < _MAX_IDLE_WORKERS:
+                self._idle_workers.append(worker)
+                return
+        worker.close()
+    
+    def _run_in_worker(self, args: List[str], timeout: int, capture: bool = False) -> Dict:
+        """Run a CLI command in a warm worker process"""
+        worker = self._checkout_worker()
+        try:
+            result = worker.run(args, timeout, capture)
+        except BaseException:
+            worker.close()
+            raise
+        self._checkin_worker(worker)
+        return result
+    
+    def close(self):
+        """Shut down the idle CLI worker processes"""
+        with self._workers_lock:
+            workers, self._idle_workers = self._idle_workers, []
+        for worker in workers:
+            worker.close()
+    
+    def _run_cli_command(self, args: List[str], timeout: int = 300, capture: bool = False) -> Dict:
+        """Run a CLI command and return the result
+        
+        stderr is always returned; stdout is discarded unless capture is
+        set, and then only its last lines are kept.
+        """
         try:
-            # Change to CLI directory
-            original_dir = os.getcwd()
-            os.chdir(self.cli_dir)
-            
-            # Setup virtual environment if it exists
-            venv_python = os.path.join(self.cli_dir, "venv", "bin", "python")
-            if os.path.exists(venv_python):
-                python_cmd = venv_python
-            else:
-                # Try to use the main project's virtual environment
-                main_venv_python = os.path.join(web_app_dir, "..", "venv", "bin", "python")
-                if os.path.exists(main_venv_python):
-                    python_cmd = main_venv_python
-                else:
-                    python_cmd = "python"
-            
             # Run CLI command
-            cmd = [python_cmd, "fontgen.py"] + args
+            cmd = [self.python_cmd, "fontgen.py"] + args
             print(f"Running CLI command: {' '.join(cmd)}")
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+            if self._use_workers:
+                result = self._run_in_worker(args, timeout, capture)
+                return {
+                    "success": result["returncode"] == 0,
+                    "stdout": result["stdout"],
+                    "stderr": result["stderr"],
+                    "returncode": result["returncode"]
+                }
             
-            os.chdir(original_dir)
+            # Run in the CLI directory without touching this process's cwd
+            if capture:
+                returncode, stdout, stderr = _run_with_tail(cmd, self.cli_dir, timeout)
+            else:
+                result = subprocess.run(
+                    cmd,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    timeout=timeout,
+                    cwd=self.cli_dir
+                )
+                returncode, stdout, stderr = result.returncode, "", result.stderr
             
             return {
-                "success": result.returncode == 0,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "returncode": result.returncode
+                "success": returncode == 0,
+                "stdout": stdout,
+                "stderr": stderr,
+                "returncode": returncode
             }
             
         except subprocess.TimeoutExpired:
-            os.chdir(original_dir)
             return {
                 "success": False,
                 "error": "Command timed out",
                 "stdout": "",
-                "stderr": "Command timed out after {timeout}s"
+                "stderr": f"Command timed out after {timeout}s"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "stdout": "",
+                "stderr": str(e)
+            }
+    
+    async def _run_cli_command_async(self, args: List[str], timeout: int = 300) -> Dict:
+        """Run a CLI command without blocking the event loop
+        
+        With the worker pool enabled the blocking call runs in a thread so the
+        warm workers are still used; otherwise the CLI is spawned directly.
+        """
+        if self._use_workers:
+            return await asyncio.to_thread(self._run_cli_command, args, timeout)
+        
+        try:
+            cmd = [self.python_cmd, "fontgen.py"] + args
+            print(f"Running CLI command: {' '.join(cmd)}")
+            
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self.cli_dir
+            )
+            try:
+                _, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return {
+                    "success": False,
+                    "error": "Command timed out",
+                    "stdout": "",
+                    "stderr": f"Command timed out after {timeout}s"
+                }
+            
+            return {
+                "success": proc.returncode == 0,
+                "stdout": "",
+                "stderr": stderr.decode(errors='replace'),
+                "returncode": proc.returncode
             }
+            
         except Exception as e:
-            os.chdir(original_dir)
             return {
                 "success": False,
                 "error": str(e),
@@ -99,104 +404,188 @@ class CLIWrapper:
             # This could be enhanced later
             pass
         
-        args = ["template"]
-        
         # Determine format based on output extension
-        if output_path.endswith('.png'):
-            args.extend(["--format", "png"])
-        else:
-            args.extend(["--format", "svg"])
+        template_format = "png" if output_path.endswith('.png') else "svg"
+        args = ["template", "--format", template_format]
+        
+        # Fail fast instead of running the CLI for a path it cannot write
+        target_path = os.path.abspath(output_path)
+        output_dir = os.path.dirname(target_path)
+        if not os.path.isdir(output_dir):
+            return {"success": False, "error": f"Output directory not found: {output_dir}"}
         
-        # Set output path
-        base_name = os.path.splitext(os.path.basename(output_path))[0]
-        args.extend(["--output", base_name])
+        # The CLI appends the extension itself, so hand it the absolute
+        # target without one and it writes the file in place
+        stem, extension = os.path.splitext(target_path)
+        if extension != f".{template_format}":
+            stem = target_path
+        args.extend(["--output", stem])
+        
+        # The template only depends on the CLI config and code, so identical
+        # requests reuse the last rendering instead of running the CLI again
+        cache_path = self._template_cache_path(template_format)
+        if cache_path and os.path.exists(cache_path):
+            try:
+                shutil.copyfile(cache_path, target_path)
+            except OSError as e:
+                print(f"Template cache read failed, regenerating: {e}")
+            else:
+                try:
+                    os.utime(cache_path)  # Mark as recently used for pruning
+                except OSError:
+                    pass
+                return {"success": True, "file_path": output_path}
         
         result = self._run_cli_command(args)
         
         if result["success"]:
-            # Move generated file to desired location
-            # For PNG format, the CLI creates the PNG directly
-            if output_path.endswith('.png'):
-                cli_output = f"{self.cli_dir}/{base_name}.png"
-            else:
-                cli_output = f"{self.cli_dir}/{base_name}.svg"
-            
+            cli_output = f"{stem}.{template_format}"
             if os.path.exists(cli_output):
-                os.rename(cli_output, output_path)
+                # Only an unusual extension on output_path needs a rename
+                if cli_output != target_path:
+                    os.replace(cli_output, target_path)
+                if cache_path:
+                    self._store_template(target_path, cache_path)
                 return {"success": True, "file_path": output_path}
         
         return {"success": False, "error": result.get("error", result.get("stderr", "Unknown error"))}
     
+    def _template_cache_path(self, template_format: str) -> Optional[str]:
+        """Return the cache file for a template rendered with the current CLI config
+        
+        Only the template layout and the ordered character lists shape the
+        template, so preview scale/bearing updates do not invalidate it.
+        """
+        self._refresh_config()
+        font_generation = self.config.get('font_generation', {})
+        template_config = {
+            'template_settings': font_generation.get('template_settings'),
+            'characters': [[name, char_set.get('characters')]
+                           for name, char_set in font_generation.get('character_sets', {}).items()]
+        }
+        key = hashlib.blake2b(json.dumps(template_config, sort_keys=True).encode('utf-8'),
+                              digest_size=16)
+        try:
+            key.update(str(os.stat(self.cli_script).st_mtime_ns).encode())
+        except OSError:
+            return None
+        return os.path.join(_TEMPLATE_CACHE_DIR, f"{key.hexdigest()}.{template_format}")
+    
+    def _store_template(self, template_path: str, cache_path: str):
+        """Copy a freshly rendered template into the cache"""
+        try:
+            os.makedirs(_TEMPLATE_CACHE_DIR, exist_ok=True)
+            # Stage under a unique name so concurrent writers never expose a partial file
+            tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copyfile(template_path, tmp_path)
+            os.replace(tmp_path, cache_path)
+            _prune_template_cache()
+        except OSError as e:
+            print(f"Could not cache template: {e}")
+    
     def generate_font_preview(self, image_path: str, font_name: str, settings: Dict = None) -> Dict:
         """Generate font preview (SVG files) using CLI
         
         This generates the full font but extracts the SVG files for preview
         """
+        args = self._prepare_preview(image_path, font_name, settings)
+        
+        # Generate full font - CLI creates SVGs as intermediate step
+        result = self._run_cli_command(args, timeout=120)
+        
+        return self._collect_preview(font_name, settings, result)
+    
+    async def generate_font_preview_async(self, image_path: str, font_name: str, settings: Dict = None) -> Dict:
+        """Async variant of generate_font_preview for use from request handlers"""
+        args = self._prepare_preview(image_path, font_name, settings)
+        
+        result = await self._run_cli_command_async(args, timeout=120)
+        
+        return await asyncio.to_thread(self._collect_preview, font_name, settings, result)
+    
+    def _prepare_preview(self, image_path: str, font_name: str, settings: Optional[Dict]) -> List[str]:
+        """Apply preview settings and return the CLI arguments"""
         
         # Update CLI config if settings provided
         if settings:
             self._update_cli_config(settings)
         
-        # Copy image to CLI directory for processing
-        cli_image_path = os.path.join(self.cli_dir, f"temp_{font_name}.png")
-        import shutil
-        shutil.copy2(image_path, cli_image_path)
+        # The CLI reads the image in place, so pass an absolute path
+        # instead of staging a copy in the CLI directory
+        return ["generate", os.path.abspath(image_path), "--name", font_name]
+    
+    def _collect_preview(self, font_name: str, settings: Optional[Dict], result: Dict) -> Dict:
+        """Move the CLI's SVGs to the web app and build the character map"""
         
-        try:
-            # Generate full font - CLI creates SVGs as intermediate step
-            args = ["generate", cli_image_path, "--name", font_name]
-            result = self._run_cli_command(args, timeout=120)
-            
-            # Check for SVG directory even if CLI had some warnings
-            svg_dir = os.path.join(self.cli_dir, f"temp_files")
-            svg_subdir = None
-            
-            # Find the SVG directory (it might have different naming)
-            if os.path.exists(svg_dir):
-                for item in os.listdir(svg_dir):
-                    if item.endswith("_svg") and font_name in item:
-                        svg_subdir = os.path.join(svg_dir, item)
-                        break
+        # Check for SVG directory even if CLI had some warnings
+        svg_dir = os.path.join(self.cli_dir, f"temp_files")
+        svg_subdir = None
+        
+        # Find the SVG directory (it might have different naming)
+        if os.path.exists(svg_dir):
+            for item in os.listdir(svg_dir):
+                if item.endswith("_svg") and font_name in item:
+                    svg_subdir = os.path.join(svg_dir, item)
+                    break
+        
+        if svg_subdir and os.path.exists(svg_subdir):
+            # Move SVG directory to web app temp location
+            web_svg_dir = f"temp_files/{font_name}_svg"
+            if os.path.exists(web_svg_dir):
+                _fast_rmtree(web_svg_dir)
+            shutil.move(svg_subdir, web_svg_dir)
             
-            if svg_subdir and os.path.exists(svg_subdir):
-                # Move SVG directory to web app temp location
-                web_svg_dir = f"temp_files/{font_name}_svg"
-                if os.path.exists(web_svg_dir):
-                    shutil.rmtree(web_svg_dir)
-                shutil.move(svg_subdir, web_svg_dir)
-                
-                # Read SVG files and create character map
-                character_map = self._build_character_map(web_svg_dir)
-                
-                return {
-                    "success": True,
-                    "svg_dir": web_svg_dir,
-                    "character_map": character_map,
-                    "settings": settings or {}
-                }
+            # Read SVG files and create character map
+            character_map = self._build_character_map(web_svg_dir)
             
             return {
-                "success": False, 
-                "error": result.get("stderr", "Font preview generation failed - no SVG files found")
+                "success": True,
+                "svg_dir": web_svg_dir,
+                "character_map": character_map,
+                "settings": settings or {}
             }
-            
-        finally:
-            # Cleanup temp image
-            if os.path.exists(cli_image_path):
-                os.remove(cli_image_path)
+        
+        return {
+            "success": False, 
+            "error": result.get("stderr", "Font preview generation failed - no SVG files found")
+        }
     
     def generate_final_font(self, original_image_path: str, font_name: str, character_customizations: Optional[Dict] = None) -> Optional[str]:
         """Generate final TTF font from original image using CLI"""
         
-        # Copy original image to CLI directory
-        import shutil
-        cli_image_path = os.path.join(self.cli_dir, f"temp_{font_name}.png")
+        # The CLI reads the original image in place via an absolute path
+        if not os.path.exists(original_image_path):
+            print(f"Original image not found: {original_image_path}")
+            return None
+        
+        args, overrides_path = self._prepare_final_font(original_image_path, font_name, character_customizations)
         try:
-            shutil.copy2(original_image_path, cli_image_path)
-        except FileNotFoundError:
+            result = self._run_cli_command(args, timeout=180)
+            return self._collect_final_font(font_name, result)
+        finally:
+            # Cleanup temp overrides file
+            if overrides_path and os.path.exists(overrides_path):
+                os.remove(overrides_path)
+    
+    async def generate_final_font_async(self, original_image_path: str, font_name: str, character_customizations: Optional[Dict] = None) -> Optional[str]:
+        """Async variant of generate_final_font for use from request handlers"""
+        
+        if not os.path.exists(original_image_path):
             print(f"Original image not found: {original_image_path}")
             return None
         
+        args, overrides_path = self._prepare_final_font(original_image_path, font_name, character_customizations)
+        try:
+            result = await self._run_cli_command_async(args, timeout=180)
+            return await asyncio.to_thread(self._collect_final_font, font_name, result)
+        finally:
+            if overrides_path and os.path.exists(overrides_path):
+                os.remove(overrides_path)
+    
+    def _prepare_final_font(self, original_image_path: str, font_name: str, character_customizations: Optional[Dict]):
+        """Write any overrides file and return (CLI arguments, overrides path)"""
+        cli_image_path = os.path.abspath(original_image_path)
+        
         # Create character overrides JSON file if customizations provided
         overrides_path = None
         if character_customizations:
@@ -208,47 +597,47 @@ class CLIWrapper:
             except Exception as e:
                 print(f"Error creating overrides file: {e}")
                 overrides_path = None
-
-        try:
-            # Generate final TTF font using CLI
-            args = ["generate", cli_image_path, "--name", font_name]
-            
-            # Add character overrides if available
-            if overrides_path:
-                args.extend(["--character-overrides", os.path.basename(overrides_path)])
-            
-            result = self._run_cli_command(args, timeout=180)
-            
-            if result["success"]:
-                # Look for generated TTF
-                cli_font_path = os.path.join(self.cli_dir, f"{font_name}.ttf")
-                if os.path.exists(cli_font_path):
-                    # Ensure downloads directory exists  
-                    web_app_dir = os.path.dirname(os.path.dirname(__file__))  # Go up from core/ to web_app/
-                    downloads_dir = os.path.join(web_app_dir, "downloads")
-                    os.makedirs(downloads_dir, exist_ok=True)
-                    
-                    # Move to web app downloads
-                    web_font_path = os.path.join(downloads_dir, f"{font_name}.ttf")
+        
+        # Generate final TTF font using CLI
+        args = ["generate", cli_image_path, "--name", font_name]
+        
+        # Add character overrides if available
+        if overrides_path:
+            args.extend(["--character-overrides", os.path.basename(overrides_path)])
+        
+        return args, overrides_path
+    
+    def _collect_final_font(self, font_name: str, result: Dict) -> Optional[str]:
+        """Move the CLI's TTF into the web app downloads directory"""
+        if result["success"]:
+            # Look for generated TTF
+            cli_font_path = os.path.join(self.cli_dir, f"{font_name}.ttf")
+            if os.path.exists(cli_font_path):
+                # Ensure downloads directory exists  
+                web_app_dir = os.path.dirname(os.path.dirname(__file__))  # Go up from core/ to web_app/
+                downloads_dir = os.path.join(web_app_dir, "downloads")
+                os.makedirs(downloads_dir, exist_ok=True)
+                
+                # Move to web app downloads; a rename is a single syscall and
+                # only a cross-filesystem move needs the copying fallback
+                web_font_path = os.path.join(downloads_dir, f"{font_name}.ttf")
+                try:
+                    os.replace(cli_font_path, web_font_path)
+                except OSError:
                     shutil.move(cli_font_path, web_font_path)
-                    return f"downloads/{font_name}.ttf"
-            
-            print(f"CLI generation failed: {result.get('stderr', 'Unknown error')}")
-            return None
-            
-        finally:
-            # Cleanup temp image
-            if os.path.exists(cli_image_path):
-                os.remove(cli_image_path)
-            
-            # Cleanup temp overrides file
-            if overrides_path and os.path.exists(overrides_path):
-                os.remove(overrides_path)
+                return f"downloads/{font_name}.ttf"
+        
+        print(f"CLI generation failed: {result.get('stderr', 'Unknown error')}")
+        return None
     
     def _update_cli_config(self, settings: Dict):
         """Update CLI config.json with new settings"""
         try:
-            config = self._load_config()
+            # Other workers share config.json, so start from what is on disk;
+            # the parse is only redone when the file actually changed.
+            # Work on a copy so a failed write leaves self.config untouched
+            self._refresh_config()
+            config = copy.deepcopy(self.config)
             
             # Update character scaling
             char_sets = config.get('font_generation', {}).get('character_sets', {})
@@ -271,93 +660,100 @@ class CLIWrapper:
             if 'right_bearing' in settings:
                 glyph_settings['right_bearing'] = settings['right_bearing']
             
-            # Save updated config
-            with open(self.config_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            # Re-submitting the same settings is common; skip the write then
+            # (self.config was just refreshed, so this compares to disk)
+            if config == self.config:
+                return
+            
+            # Save updated config (kept indented, it is the hand-edited CLI config).
+            # Write beside it under a unique name and swap in, so neither a
+            # crash nor a concurrent writer ever leaves a torn file
+            tmp_path = f"{self.config_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(config, f, indent=2)
+                os.replace(tmp_path, self.config_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            self.config = config
+            self._config_stamp = self._config_file_stamp()
+            self._scale_by_char = None
                 
         except Exception as e:
             print(f"Error updating CLI config: {e}")
     
-    def _build_character_map(self, svg_dir: str) -> Dict:
-        """Build character map from SVG files"""
+    def _build_character_map(self, svg_dir: str, extract_info: bool = False) -> Dict:
+        """Build character map from SVG files
+
+        The preview inlines svg_content directly, so the parsed viewBox/paths
+        are only added when extract_info is set.
+        """
         character_map = {}
         
         if not os.path.exists(svg_dir):
             return character_map
         
-        for svg_file in os.listdir(svg_dir):
-            if svg_file.endswith('.svg'):
-                char_name = svg_file.replace('.svg', '')
-                
-                # Convert filename back to character
-                actual_char = self._filename_to_char(char_name)
-                
-                # Read SVG content
-                svg_path = os.path.join(svg_dir, svg_file)
-                try:
-                    with open(svg_path, 'r') as f:
-                        svg_content = f.read()
-                    
-                    # Extract basic SVG info
-                    svg_info = self._extract_svg_info(svg_content)
-                    
-                    character_map[actual_char] = {
-                        'svg_content': svg_content,
-                        'svg_info': svg_info,
-                        'scale_factor': self._get_character_scale(actual_char)
-                    }
-                    
-                except Exception as e:
-                    print(f"Error reading SVG {svg_file}: {e}")
+        # scandir entries carry the name, path and file type, so no extra
+        # stat or path join is needed per glyph
+        with os.scandir(svg_dir) as entries:
+            svg_files = [(entry.name, entry.path) for entry in entries
+                         if entry.name.endswith('.svg') and entry.is_file(follow_symlinks=False)]
+        
+        # The reads are small and latency-bound, so overlap them in threads
+        paths = [path for _, path in svg_files]
+        if len(paths) < _PARALLEL_READ_THRESHOLD:
+            contents = [_read_svg(path) for path in paths]
+        else:
+            with ThreadPoolExecutor(max_workers=min(32, len(paths))) as pool:
+                contents = list(pool.map(_read_svg, paths))
+        
+        for (svg_file, _), svg_content in zip(svg_files, contents):
+            if isinstance(svg_content, Exception):
+                print(f"Error reading SVG {svg_file}: {svg_content}")
+                continue
+            
+            # Convert filename back to character
+            actual_char = self._filename_to_char(svg_file.replace('.svg', ''))
+            
+            character_map[actual_char] = {
+                'svg_content': svg_content,
+                'scale_factor': self._get_character_scale(actual_char)
+            }
+            
+            if extract_info:
+                character_map[actual_char]['svg_info'] = self._extract_svg_info(svg_content)
         
         return character_map
     
     def _char_to_filename(self, char: str) -> str:
         """Convert character to safe filename (matches CLI logic)"""
-        char_map = {
-            '/': 'slash', '\\': 'backslash', ':': 'colon',
-            '*': 'asterisk', '?': 'question', '"': 'quote',
-            "'": 'apostrophe', '<': 'less', '>': 'greater',
-            '|': 'pipe', ' ': 'space'
-        }
-        
-        if char in char_map:
-            return char_map[char]
-        elif not char.isalnum() and char not in '-_.':
+        if char in _CHAR_TO_NAME:
+            return _CHAR_TO_NAME[char]
+        elif not char.isalnum() and char not in _FILENAME_SAFE_PUNCTUATION:
             return f'char_{ord(char)}'
         else:
             return char
     
     def _filename_to_char(self, filename: str) -> str:
         """Convert safe filename back to character (matches CLI logic)"""
-        char_map = {
-            'slash': '/', 'backslash': '\\', 'colon': ':',
-            'asterisk': '*', 'question': '?', 'quote': '"',
-            'apostrophe': "'", 'less': '<', 'greater': '>',
-            'pipe': '|', 'space': ' ', 'exclamation': '!',
-            'hash': '#', 'ampersand': '&', 'at': '@',
-            'percent': '%', 'greater': '>', 'less': '<',
-            'backtick': '`', 'tilde': '~'
-        }
-        
         # Handle Unicode decimal format (e.g., "0048" -> "0")
         if filename.isdigit():
             return chr(int(filename))
         
         # Handle char_XXX format (ASCII codes)
-        if filename.startswith('char_') and filename[5:].isdigit():
-            return chr(int(filename[5:]))
+        code_match = _CHAR_CODE_RE.fullmatch(filename)
+        if code_match:
+            return chr(int(code_match.group(1)))
         
-        return char_map.get(filename, filename)
+        return _NAME_TO_CHAR.get(filename, filename)
     
     def _extract_svg_info(self, svg_content: str) -> Dict:
         """Extract viewBox and path info from SVG"""
-        import re
-        
-        viewbox_match = re.search(r'viewBox="([^"]*)"', svg_content)
+        viewbox_match = _VIEWBOX_RE.search(svg_content)
         viewbox = viewbox_match.group(1) if viewbox_match else "0 0 100 100"
         
-        path_matches = re.findall(r'<path[^>]*d="([^"]*)"', svg_content)
+        path_matches = _PATH_RE.findall(svg_content)
         paths = path_matches if path_matches else []
         
         return {
@@ -369,26 +765,20 @@ class CLIWrapper:
     
     def _get_character_scale(self, char: str) -> float:
         """Get character scale factor from config"""
-        char_sets = self.config.get('font_generation', {}).get('character_sets', {})
-        
-        for _, char_set in char_sets.items():
-            if char in char_set.get('characters', []):
-                # Check for individual scaling override
+        if self._scale_by_char is None:
+            # Flatten the character sets once; the first set listing a
+            # character wins, with its individual scaling override if any
+            scales = {}
+            char_sets = self.config.get('font_generation', {}).get('character_sets', {})
+            for char_set in char_sets.values():
                 individual_scaling = char_set.get('individual_scaling', {})
-                return individual_scaling.get(char, char_set.get('scale_factor', 3.0))
+                set_scale = char_set.get('scale_factor', 3.0)
+                for set_char in char_set.get('characters', []):
+                    scales.setdefault(set_char, individual_scaling.get(set_char, set_scale))
+            self._scale_by_char = scales
         
-        return 3.0  # Default scale
+        return self._scale_by_char.get(char, 3.0)  # Default scale
     
     def get_character_sets(self) -> Dict:
-        """Get available character sets"""
-        return {
-            "English Basic": {
-                "uppercase": list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"),
-                "lowercase": list("abcdefghijklmnopqrstuvwxyz"),
-                "numbers": list("0123456789"),
-                "symbols": ['!', '@', '#', '$', '%', '^', '&', '*', '(', ')', '-', '_', '=', '+', '[', ']', '{', '}', '|', '\\', ';', ':', '"', "'", '<', '>', ',', '.', '/', '?', '`', '~']
-            },
-            "Spanish Extensions": {
-                "spanish_accented": ['á', 'é', 'í', 'ó', 'ú', 'ü', 'ñ', 'Á', 'É', 'Í', 'Ó', 'Ú', 'Ü', 'Ñ', '¿', '¡']
-            }
-        }
\ No newline at end of file
+        """Get available character sets (shared, treat as read-only)"""
+        return _CHARACTER_SETS
\ No newline at end of file
@@ -4,13 +4,172 @@ Core font generation functionality extracted from fontgen.py
 
 import os
 import json
+import hashlib
+import functools
 import subprocess
 import tempfile
 import shutil
+import threading
 from pathlib import Path
-from PIL import Image, ImageEnhance, ImageFilter
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageFilter, ImageStat
 import xml.etree.ElementTree as ET
 
+# Resolved once at import; a PATH lookup instead of launching fontforge --version
+_FONTFORGE_PATH = shutil.which('fontforge')
+
+# Entities for characters that cannot appear raw in template SVG text
+_XML_ESCAPE = str.maketrans({'<': '&lt;', '>': '&gt;', '&': '&amp;', '"': '&quot;', "'": '&#39;'})
+
+# Most PBM files handed to a single potrace call; keeps argv well within limits
+_POTRACE_BATCH_SIZE = 64
+
+# Traced glyph SVGs keyed by a hash of their PBM and the potrace settings
+_GLYPH_CACHE_DIR = os.path.join("temp_files", "glyph_cache")
+
+# Entries kept in the glyph cache; the least recently used go first
+_GLYPH_CACHE_MAX_ENTRIES = 2000
+
+
+@functools.lru_cache(maxsize=None)
+def _contrast_threshold_lut(mean, contrast_factor, threshold):
+    """Lookup table equivalent to ImageEnhance.Contrast followed by a threshold
+    
+    The contrast step is run by Pillow itself over a 256-pixel ramp, so the
+    table matches its rounding exactly.
+    """
+    ramp = Image.frombytes('L', (256, 1), bytes(range(256)))
+    contrasted = Image.blend(Image.new('L', (256, 1), mean), ramp, contrast_factor)
+    return [0 if value < threshold else 255 for value in contrasted.tobytes()]
+
+
+def _prune_glyph_cache():
+    """Drop the least recently used glyph cache entries beyond the size cap
+
+    Concurrent builds prune and replace the same entries, so an entry that
+    vanishes between listing, stat and remove is simply skipped.
+    """
+    cached = []
+    try:
+        with os.scandir(_GLYPH_CACHE_DIR) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.svg'):
+                    continue
+                try:
+                    cached.append((entry.stat().st_mtime_ns, entry.path))
+                except FileNotFoundError:
+                    continue
+    except FileNotFoundError:
+        return
+    if len(cached) > _GLYPH_CACHE_MAX_ENTRIES:
+        cached.sort()
+        for _, path in cached[:len(cached) - _GLYPH_CACHE_MAX_ENTRIES]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _props_path(script_path):
+    """Path of the character properties JSON written beside a FontForge script"""
+    return f"{os.path.splitext(script_path)[0]}_props.json"
+
+
+def _list_files(directory, suffix):
+    """Regular files in directory ending with suffix, as Paths
+    
+    scandir already knows each entry's name and type, so this skips the
+    pattern matching and extra stat calls of Path.glob.
+    """
+    with os.scandir(directory) as entries:
+        return [Path(entry.path) for entry in entries
+                if entry.name.endswith(suffix) and entry.is_file(follow_symlinks=False)]
+
+
+def _split_batches(items):
+    """Split work into one batch per core, capped at _POTRACE_BATCH_SIZE items"""
+    batch_size = min(_POTRACE_BATCH_SIZE, max(1, -(-len(items) // (os.cpu_count() or 1))))
+    return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+
+def _run_potrace(pbm_files, pbm_dir, svg_dir, potrace_args):
+    """Trace PBM files with one potrace call; returns the ones that succeeded"""
+    # Given several inputs and no --output, potrace writes each
+    # <stem>.svg beside its PBM; those are then moved into svg_dir
+    traced_paths = [os.path.join(pbm_dir, f"{pbm_file.stem}.svg") for pbm_file in pbm_files]
+    for traced_path in traced_paths:
+        if os.path.exists(traced_path):
+            os.remove(traced_path)
+    
+    # Run potrace with configured settings; output is only read on failure
+    cmd = ['potrace', '--svg'] + potrace_args + [str(pbm_file) for pbm_file in pbm_files]
+    try:
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       timeout=30 * len(pbm_files))
+    except Exception:
+        pass  # Whatever did not get traced is retried or reported below
+    
+    converted = []
+    untraced = []
+    for pbm_file, traced_path in zip(pbm_files, traced_paths):
+        if os.path.exists(traced_path):
+            os.replace(traced_path, os.path.join(svg_dir, f"{pbm_file.stem}.svg"))
+            converted.append(pbm_file)
+        else:
+            untraced.append(pbm_file)
+    
+    # potrace stops at the first bad input, so retry the rest singly
+    if len(pbm_files) > 1:
+        for pbm_file in untraced:
+            converted.extend(_run_potrace([pbm_file], pbm_dir, svg_dir, potrace_args))
+        return converted
+    for pbm_file, traced_path in zip(untraced, traced_paths):
+        # Run it again with the output captured to report why it failed
+        try:
+            stderr = subprocess.run(cmd, capture_output=True, text=True, timeout=30).stderr
+        except Exception as e:
+            stderr = str(e)
+        if os.path.exists(traced_path):
+            os.replace(traced_path, os.path.join(svg_dir, f"{pbm_file.stem}.svg"))
+            converted.append(pbm_file)
+        else:
+            print(f"Potrace failed for {pbm_file.name}: {stderr}")
+    return converted
+
+
+def _save_pbm(crop, pbm_dir, potrace_config):
+    """Binarize a (safe filename, image) crop into pbm_dir; returns its path or None"""
+    safe_char, char_img = crop
+    try:
+        pbm_file = Path(pbm_dir) / f"{safe_char}.pbm"
+        _binarize_glyph(char_img, potrace_config).save(pbm_file)
+        return pbm_file
+        
+    except Exception as e:
+        print(f"Error processing {safe_char}: {e}")
+        return None
+
+
+def _binarize_glyph(img, potrace_config):
+    """Crop the box border off a character image and threshold it to mode '1'"""
+    border_crop = potrace_config['border_crop']
+    
+    # Crop borders to remove template box lines
+    width, height = img.size
+    if width > border_crop * 2 and height > border_crop * 2:
+        img = img.crop((border_crop, border_crop, 
+                      width - border_crop, height - border_crop))
+    
+    # Convert to grayscale
+    if img.mode != 'L':
+        img = img.convert('L')
+    
+    # Enhance contrast and threshold to a binary image in one
+    # pass, through a lookup table built for this glyph's mean
+    mean = int(ImageStat.Stat(img).mean[0] + 0.5)
+    lut = _contrast_threshold_lut(mean, potrace_config['contrast_enhancement'], potrace_config['threshold'])
+    return img.point(lut, mode='1')
+
 
 class FontGenerator:
     def __init__(self, config_path="config.json"):
@@ -133,8 +292,9 @@ class FontGenerator:
         
         return char
     
-    def get_all_characters(self):
-        """Get all characters from all character sets"""
+    @functools.cached_property
+    def all_characters(self):
+        """All characters from all character sets, flattened once per config"""
         chars = []
         
         # Handle both old and new config structures
@@ -144,7 +304,11 @@ class FontGenerator:
         
         for char_set in character_sets.values():
             chars.extend(char_set['characters'])
-        return chars
+        return tuple(chars)
+    
+    def get_all_characters(self):
+        """Get all characters from all character sets"""
+        return self.all_characters
     
     def get_character_sets(self):
         """Get available character sets"""
@@ -192,39 +356,39 @@ class FontGenerator:
         width = margin + (chars_per_row * (box_size + box_spacing)) - box_spacing + margin
         height = margin + (num_rows * (box_size + box_spacing)) - box_spacing + margin
         
-        # Create SVG
-        svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>
+        # Write the SVG straight to the file as it is built; the buffered
+        # writer avoids re-copying an ever-growing string for every box
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(f'''<?xml version="1.0" encoding="UTF-8"?>
 <svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">
     <style>
-        .char-box {{ fill: white; stroke: black; stroke-width: 2; }}
+        .char-box {{ fill: white; stroke: black; stroke-width: 2; shape-rendering: crispEdges; }}
         .char-label {{ font-family: Arial, sans-serif; font-size: 14px; text-anchor: middle; dominant-baseline: middle; }}
     </style>
     <rect width="{width}" height="{height}" fill="white"/>
-'''
-        
-        # Add character boxes
-        for i, char in enumerate(characters):
-            row = i // chars_per_row
-            col = i % chars_per_row
-            
-            x = margin + col * (box_size + box_spacing)
-            y = margin + row * (box_size + box_spacing)
+''')
             
-            # Escape special characters for XML
-            display_char = char
-            if char in ['<', '>', '&', '"', "'"]:
-                display_char = {'<': '&lt;', '>': '&gt;', '&': '&amp;', '"': '&quot;', "'": '&#39;'}[char]
+            # Box positions only depend on the row and column
+            pitch = box_size + box_spacing
+            xs = [margin + col * pitch for col in range(chars_per_row)]
+            ys = [margin + row * pitch for row in range(num_rows)]
+            half_box = box_size // 2
             
-            svg_content += f'''
+            # Add character boxes
+            for i, char in enumerate(characters):
+                row, col = divmod(i, chars_per_row)
+                x = xs[col]
+                y = ys[row]
+                
+                # Escape special characters for XML
+                display_char = char.translate(_XML_ESCAPE)
+                
+                f.write(f'''
     <rect class="char-box" x="{x}" y="{y}" width="{box_size}" height="{box_size}"/>
-    <text class="char-label" x="{x + box_size//2}" y="{y - 10}">{display_char}</text>
-'''
-        
-        svg_content += '</svg>'
-        
-        # Write SVG file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(svg_content)
+    <text class="char-label" x="{x + half_box}" y="{y - 10}">{display_char}</text>
+''')
+            
+            f.write('</svg>')
         
         return True
     
@@ -233,9 +397,9 @@ class FontGenerator:
         try:
             import cairosvg
             
-            # Read SVG to get dimensions
-            tree = ET.parse(svg_path)
-            root = tree.getroot()
+            # Read the dimensions off the root element without building the tree
+            with open(svg_path, 'rb') as f:
+                _, root = next(ET.iterparse(f, events=('start',)))
             svg_width = float(root.get('width', 800))
             svg_height = float(root.get('height', 600))
             
@@ -252,12 +416,11 @@ class FontGenerator:
             print(f"Error converting SVG to PNG: {e}")
             return False
     
-    def extract_characters_from_image(self, image_path, font_name):
-        """Extract individual character images from filled template"""
-        # Create output directory
-        output_dir = f"temp_files/{font_name}_characters"
-        os.makedirs(output_dir, exist_ok=True)
+    def _crop_characters(self, image_path):
+        """Crop every character box out of a filled template
         
+        Returns (safe filename, cropped RGB image) pairs in character order.
+        """
         # Load and process image
         img = Image.open(image_path)
         if img.mode != 'RGB':
@@ -288,35 +451,30 @@ class FontGenerator:
         
         # Extract characters
         characters = self.get_all_characters()
-        extracted_files = []
+        crops = []
+        
+        # Box positions (scaled) only depend on the row and column, so
+        # compute each one once instead of per character
+        pitch = box_size + box_spacing
+        num_rows = (len(characters) + chars_per_row - 1) // chars_per_row
+        xs = [int((margin + col * pitch) * scale_factor) for col in range(chars_per_row)]
+        ys = [int((margin + row * pitch) * scale_factor) for row in range(num_rows)]
+        scaled_box_size = int(box_size * scale_factor)
         
         for i, char in enumerate(characters):
-            row = i // chars_per_row
-            col = i % chars_per_row
-            
-            # Calculate box position (scaled)
-            x = int((margin + col * (box_size + box_spacing)) * scale_factor)
-            y = int((margin + row * (box_size + box_spacing)) * scale_factor)
-            scaled_box_size = int(box_size * scale_factor)
+            row, col = divmod(i, chars_per_row)
+            x = xs[col]
+            y = ys[row]
             
             # Extract character box
             char_img = img.crop((x, y, x + scaled_box_size, y + scaled_box_size))
-            
-            # Save character image with safe filename
-            safe_char = self.make_safe_filename(char)
-            char_path = os.path.join(output_dir, f"{safe_char}.png")
-            char_img.save(char_path)
-            extracted_files.append(char_path)
+            crops.append((self.make_safe_filename(char), char_img))
         
-        print(f"Character images extracted to: {output_dir}")
-        return output_dir
+        return crops
     
-    def preprocess_for_potrace(self, char_dir):
-        """Preprocess character images for potrace conversion"""
-        pbm_dir = char_dir.replace('_characters', '_pbm')
-        os.makedirs(pbm_dir, exist_ok=True)
-        
-        potrace_config = self.config.get('potrace_settings', self.config.get('font_generation', {}).get('potrace_settings', {
+    def _get_potrace_config(self):
+        """Potrace settings - handle both config structures"""
+        return self.config.get('potrace_settings', self.config.get('font_generation', {}).get('potrace_settings', {
             'border_crop': 4,
             'contrast_enhancement': 3.0,
             'threshold': 140,
@@ -324,90 +482,135 @@ class FontGenerator:
             'alphamax': 1.0,
             'opttolerance': 0.2
         }))
-        border_crop = potrace_config['border_crop']
-        contrast_factor = potrace_config['contrast_enhancement']
-        threshold = potrace_config['threshold']
+    
+    def extract_characters_from_image(self, image_path, font_name):
+        """Extract individual character images from filled template"""
+        # Create output directory
+        output_dir = f"temp_files/{font_name}_characters"
+        os.makedirs(output_dir, exist_ok=True)
+        
+        # The PNGs are scratch files read straight back by preprocess_for_potrace,
+        # so favour encode speed over size; zlib releases the GIL, so the
+        # encodes overlap across threads
+        def save_crop(crop):
+            safe_char, char_img = crop
+            char_img.save(os.path.join(output_dir, f"{safe_char}.png"), compress_level=1)
         
-        processed_count = 0
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            list(executor.map(save_crop, self._crop_characters(image_path)))
         
-        for char_file in Path(char_dir).glob('*.png'):
+        print(f"Character images extracted to: {output_dir}")
+        return output_dir
+    
+    def preprocess_for_potrace(self, char_dir):
+        """Preprocess character images for potrace conversion"""
+        pbm_dir = char_dir.replace('_characters', '_pbm')
+        os.makedirs(pbm_dir, exist_ok=True)
+        
+        potrace_config = self._get_potrace_config()
+        
+        def preprocess_one(char_file):
             try:
-                # Load image
-                img = Image.open(char_file)
-                
-                # Crop borders to remove template box lines
-                width, height = img.size
-                if width > border_crop * 2 and height > border_crop * 2:
-                    img = img.crop((border_crop, border_crop, 
-                                  width - border_crop, height - border_crop))
-                
-                # Convert to grayscale
-                if img.mode != 'L':
-                    img = img.convert('L')
-                
-                # Enhance contrast
-                enhancer = ImageEnhance.Contrast(img)
-                img = enhancer.enhance(contrast_factor)
-                
-                # Apply threshold to create binary image
-                img = img.point(lambda x: 0 if x < threshold else 255, mode='1')
-                
-                # Save as PBM (bitmap format that potrace likes)
-                pbm_path = os.path.join(pbm_dir, f"{char_file.stem}.pbm")
-                img.save(pbm_path)
-                processed_count += 1
+                # Load image and save as PBM (bitmap format that potrace likes)
+                img = _binarize_glyph(Image.open(char_file), potrace_config)
+                img.save(os.path.join(pbm_dir, f"{char_file.stem}.pbm"))
+                return True
                 
             except Exception as e:
                 print(f"Error processing {char_file.name}: {e}")
-                continue
+                return False
+        
+        # PIL releases the GIL while decoding and encoding, so glyphs overlap
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            processed_count = sum(executor.map(preprocess_one, _list_files(char_dir, '.png')))
         
         print(f"✅ Preprocessed {processed_count} characters for potrace")
         return pbm_dir
     
+    def extract_and_trace(self, image_path, font_name):
+        """Run crop, binarize and potrace for each chunk of characters independently
+        
+        Each worker takes its glyphs all the way to SVG, so tracing starts as
+        soon as a chunk is binarized instead of after every glyph is.
+        """
+        pbm_dir = f"temp_files/{font_name}_pbm"
+        svg_dir = f"temp_files/{font_name}_svg"
+        os.makedirs(pbm_dir, exist_ok=True)
+        os.makedirs(svg_dir, exist_ok=True)
+        os.makedirs(_GLYPH_CACHE_DIR, exist_ok=True)
+        
+        potrace_config = self._get_potrace_config()
+        
+        def process_chunk(crops):
+            pbm_files = [pbm_file for pbm_file in (_save_pbm(crop, pbm_dir, potrace_config) for crop in crops)
+                         if pbm_file is not None]
+            return self._trace_pbm_files(pbm_files, pbm_dir, svg_dir, potrace_config)
+        
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            successful_conversions = sum(executor.map(process_chunk, _split_batches(self._crop_characters(image_path))))
+        _prune_glyph_cache()
+        
+        print(f"✅ Potrace converted {successful_conversions} characters to SVG")
+        return svg_dir if successful_conversions > 0 else None
+    
     def potrace_to_svg(self, pbm_dir):
         """Convert PBM files to SVG using potrace"""
         svg_dir = pbm_dir.replace('_pbm', '_svg')
         os.makedirs(svg_dir, exist_ok=True)
+        os.makedirs(_GLYPH_CACHE_DIR, exist_ok=True)
         
-        potrace_config = self.config.get('potrace_settings', self.config.get('font_generation', {}).get('potrace_settings', {
-            'border_crop': 4,
-            'contrast_enhancement': 3.0,
-            'threshold': 140,
-            'turnpolicy': 'minority',
-            'alphamax': 1.0,
-            'opttolerance': 0.2
-        }))
-        successful_conversions = 0
+        potrace_config = self._get_potrace_config()
         
-        for pbm_file in Path(pbm_dir).glob('*.pbm'):
-            try:
-                svg_path = os.path.join(svg_dir, f"{pbm_file.stem}.svg")
-                
-                # Run potrace with configured settings
-                cmd = [
-                    'potrace',
-                    '--svg',
-                    '--output', svg_path,
-                    '--turnpolicy', potrace_config['turnpolicy'],
-                    '--alphamax', str(potrace_config['alphamax']),
-                    '--opttolerance', str(potrace_config['opttolerance']),
-                    str(pbm_file)
-                ]
-                
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-                
-                if result.returncode == 0 and os.path.exists(svg_path):
-                    successful_conversions += 1
-                else:
-                    print(f"Potrace failed for {pbm_file.name}: {result.stderr}")
-                    
-            except Exception as e:
-                print(f"Error running potrace on {pbm_file.name}: {e}")
-                continue
+        def trace_batch(pbm_files):
+            return self._trace_pbm_files(pbm_files, pbm_dir, svg_dir, potrace_config)
+        
+        # One potrace process per batch amortises its startup over many
+        # glyphs; a batch per core keeps every core busy
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            successful_conversions = sum(executor.map(trace_batch, _split_batches(_list_files(pbm_dir, '.pbm'))))
+        _prune_glyph_cache()
         
         print(f"✅ Potrace converted {successful_conversions} characters to SVG")
         return svg_dir if successful_conversions > 0 else None
     
+    def _trace_pbm_files(self, pbm_files, pbm_dir, svg_dir, potrace_config):
+        """Trace PBM files from pbm_dir into svg_dir; returns how many succeeded
+        
+        Glyphs whose bitmap and potrace settings match an earlier run are
+        copied from the cache, the rest go through a single potrace call.
+        """
+        potrace_args = [
+            '--turnpolicy', potrace_config['turnpolicy'],
+            '--alphamax', str(potrace_config['alphamax']),
+            '--opttolerance', str(potrace_config['opttolerance'])
+        ]
+        settings_key = '|'.join(potrace_args).encode()
+        
+        cache_paths = {}
+        untraced = []
+        cached_conversions = 0
+        for pbm_file in pbm_files:
+            digest = hashlib.blake2b(settings_key, digest_size=16)
+            digest.update(pbm_file.read_bytes())
+            cache_path = os.path.join(_GLYPH_CACHE_DIR, f"{digest.hexdigest()}.svg")
+            try:
+                shutil.copyfile(cache_path, os.path.join(svg_dir, f"{pbm_file.stem}.svg"))
+                os.utime(cache_path)  # Mark as recently used
+                cached_conversions += 1
+            except FileNotFoundError:
+                cache_paths[pbm_file] = cache_path
+                untraced.append(pbm_file)
+        
+        traced = _run_potrace(untraced, pbm_dir, svg_dir, potrace_args) if untraced else []
+        
+        # Stage each entry and swap it in so other builds never read half a file
+        for pbm_file in traced:
+            staging_path = f"{cache_paths[pbm_file]}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copyfile(os.path.join(svg_dir, f"{pbm_file.stem}.svg"), staging_path)
+            os.replace(staging_path, cache_paths[pbm_file])
+        
+        return cached_conversions + len(traced)
+    
     def update_config(self, new_settings):
         """Update configuration with new settings"""
         
@@ -439,8 +642,9 @@ class FontGenerator:
             if 'right_bearing' in new_settings:
                 glyph_settings_path['right_bearing'] = new_settings['right_bearing']
         
-        # Rebuild character properties
+        # Rebuild character properties and drop the cached character list
         self.char_properties = self._build_char_properties()
+        self.__dict__.pop('all_characters', None)
     
     def create_fontforge_script_with_svg(self, svg_dir, font_name):
         """Create FontForge script that imports SVG files with character-specific scaling"""
@@ -460,9 +664,22 @@ class FontGenerator:
             'space_width': 1800
         }))
         
-        script_content = f'''#!/usr/bin/env fontforge
+        # Write script file to the temp directory rather than the working
+        # directory, so concurrent builds of the same font cannot collide;
+        # the caller removes it. The character properties go in a JSON
+        # sidecar next to it instead of a large dict literal in the script
+        script_file = tempfile.NamedTemporaryFile('w', suffix='.py', prefix=f"{font_name}_fontforge_",
+                                                  delete=False)
+        script_path = script_file.name
+        props_path = _props_path(script_path)
+        try:
+            with open(props_path, 'w', encoding='utf-8') as f:
+                json.dump(self.char_properties, f)
+        
+            script_content = f'''#!/usr/bin/env fontforge
 
 import fontforge
+import json
 import os
 import sys
 
@@ -479,8 +696,9 @@ font.descent = {font_props['descent']}
 font.os2_typoascent = {font_props.get('typo_ascent', font_props['ascent'])}
 font.os2_typodescent = {font_props.get('typo_descent', -font_props['descent'])}
 
-# Character properties mapping
-char_properties = {self.char_properties!r}
+# Character properties mapping, written beside this script
+with open({props_path!r}, encoding='utf-8') as props_file:
+    char_properties = json.load(props_file)
 
 successful_chars = 0
 svg_directory = "{svg_dir}"
@@ -528,11 +746,8 @@ for svg_file in os.listdir(svg_directory):
         
         # Apply character-specific scaling and positioning
         if glyph.isWorthOutputting():
-            # Transform: scale and position
-            transform = fontforge.identity
-            transform = fontforge.compose(transform, fontforge.scale(scale_factor))
-            transform = fontforge.compose(transform, fontforge.translate(0, baseline_offset))
-            glyph.transform(transform)
+            # Transform: scale, then move to the baseline, as one 2x3 matrix
+            glyph.transform((scale_factor, 0, 0, scale_factor, 0, baseline_offset))
             
             successful_chars += 1
             print(f"✅ {{actual_char}}: scaled {{scale_factor}}x, baseline {{baseline_offset}}")
@@ -572,10 +787,15 @@ else:
     sys.exit(1)
 '''
         
-        # Write script file
-        script_path = f"{font_name}_fontforge.py"
-        with open(script_path, 'w') as f:
-            f.write(script_content)
+            with script_file:
+                script_file.write(script_content)
+        except BaseException:
+            # Do not leak the script or its sidecar if anything above failed
+            script_file.close()
+            for path in (script_path, props_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            raise
         
         return script_path
     
@@ -584,23 +804,13 @@ else:
         print(f"🚀 Generating TTF font with potrace: '{font_name}'")
         
         # Check if FontForge is available
-        try:
-            subprocess.run(['fontforge', '--version'], capture_output=True, check=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        if _FONTFORGE_PATH is None:
             print("❌ FontForge is required but not found!")
             print("Install with: brew install fontforge")
             return False
         
-        # Step 1: Extract character images
-        char_dir = self.extract_characters_from_image(image_path, font_name)
-        if not char_dir:
-            return False
-        
-        # Step 2: Preprocess for potrace
-        pbm_dir = self.preprocess_for_potrace(char_dir)
-        
-        # Step 3: Convert to SVG with potrace
-        svg_dir = self.potrace_to_svg(pbm_dir)
+        # Steps 1-3: Extract, preprocess and trace each chunk of characters
+        svg_dir = self.extract_and_trace(image_path, font_name)
         if not svg_dir:
             print("❌ Potrace conversion failed")
             return False
@@ -615,7 +825,7 @@ else:
         # Step 5: Run FontForge
         try:
             print("🔨 Running FontForge with potrace vectors...")
-            result = subprocess.run(['fontforge', '-script', script_path], 
+            result = subprocess.run([_FONTFORGE_PATH or 'fontforge', '-script', script_path], 
                                   capture_output=True, text=True, timeout=300)
             
             print("FontForge output:")
@@ -642,4 +852,7 @@ else:
             return None
         except Exception as e:
             print(f"❌ Error running FontForge: {e}")
-            return None
\ No newline at end of file
+            return None
+        finally:
+            os.remove(script_path)
+            os.remove(_props_path(script_path))
\ No newline at end of file
@@ -5,32 +5,152 @@ FontGen Web UI - FastAPI Backend
 from fastapi import FastAPI, UploadFile, File, Form, Request, HTTPException
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 import os
 import json
-import shutil
+import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import List, Dict, Optional
-import uuid
+import secrets
+
+try:
+    import aiofiles
+    AIOFILES_AVAILABLE = True
+except ImportError:
+    AIOFILES_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from core.cli_wrapper import CLIWrapper
 
-app = FastAPI(title="FontGen Web UI", description="Generate custom TTF fonts from handwriting")
+if ORJSON_AVAILABLE:
+    class APIResponse(JSONResponse):
+        """JSONResponse encoded with orjson"""
+
+        def render(self, content) -> bytes:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+    _loads = orjson.loads
+else:
+    APIResponse = JSONResponse
+    _loads = json.loads
+
+# Directories the app reads and writes at runtime
+REQUIRED_DIRS = ("uploads", "downloads", "temp_files", "static")
+
 
-# Create required directories FIRST
-os.makedirs("uploads", exist_ok=True)
-os.makedirs("downloads", exist_ok=True)
-os.makedirs("temp_files", exist_ok=True)
-os.makedirs("static", exist_ok=True)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create required directories before the first request is served"""
+    await asyncio.gather(*(asyncio.to_thread(os.makedirs, directory, exist_ok=True)
+                           for directory in REQUIRED_DIRS))
+    yield
 
-# Setup templates and static files AFTER directories exist
+app = FastAPI(title="FontGen Web UI", description="Generate custom TTF fonts from handwriting",
+              default_response_class=APIResponse, lifespan=lifespan)
+
+# Setup templates and static files; the mounted directories are created at startup
 templates = Jinja2Templates(directory="templates")
-app.mount("/static", StaticFiles(directory="static"), name="static")
-app.mount("/downloads", StaticFiles(directory="downloads"), name="downloads")
+app.mount("/static", StaticFiles(directory="static", check_dir=False), name="static")
+app.mount("/downloads", StaticFiles(directory="downloads", check_dir=False), name="downloads")
 
 # Global CLI wrapper instance  
 cli_wrapper = CLIWrapper()
 
+# Character sets are fixed for the life of the process
+CHARACTER_SETS = cli_wrapper.get_character_sets()
+
+# Large payloads are streamed as JSON instead of encoded in one buffer
+def _dumps(obj) -> str:
+    """Encode a value the same way APIResponse does"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"))
+
+
+def _iter_json_object(payload: Dict):
+    """Yield a JSON object piece by piece, one entry of each list or dict value at a time"""
+    yield "{"
+    for index, (key, value) in enumerate(payload.items()):
+        yield ("," if index else "") + _dumps(key) + ":"
+        if isinstance(value, dict):
+            yield "{"
+            for item_index, (item_key, item) in enumerate(value.items()):
+                yield ("," if item_index else "") + _dumps(item_key) + ":" + _dumps(item)
+            yield "}"
+        elif isinstance(value, (list, tuple)) or hasattr(value, '__next__'):
+            yield "["
+            for item_index, item in enumerate(value):
+                yield ("," if item_index else "") + _dumps(item)
+            yield "]"
+        else:
+            yield _dumps(value)
+    yield "}"
+
+# Uploads are copied to disk in 1 MiB chunks so the event loop stays free
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Filled templates are single scans or photos; anything larger is rejected
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024
+
+# Leading bytes of the image formats the CLI can read
+IMAGE_SIGNATURES = (
+    b'\x89PNG\r\n\x1a\n',  # PNG
+    b'\xff\xd8\xff',         # JPEG
+    b'GIF87a', b'GIF89a',     # GIF
+    b'BM',                    # BMP
+    b'II*\x00', b'MM\x00*',   # TIFF
+)
+
+
+def _is_image_header(head: bytes) -> bool:
+    """Check the first bytes of an upload against known image signatures"""
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return True
+    return head.startswith(IMAGE_SIGNATURES)
+
+
+async def _save_upload(upload: UploadFile, file_path: str, head: bytes = b''):
+    """Stream an uploaded file to disk without blocking the event loop
+
+    head holds bytes already read from the upload; they are written first.
+    Raises HTTPException(413) and removes the partial file once the upload
+    grows past MAX_UPLOAD_SIZE.
+    """
+    size = 0
+
+    async def chunks():
+        nonlocal size
+        chunk = head
+        while chunk:
+            size += len(chunk)
+            if size > MAX_UPLOAD_SIZE:
+                raise HTTPException(status_code=413, detail="File is too large")
+            yield chunk
+            chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+
+    try:
+        if AIOFILES_AVAILABLE:
+            async with aiofiles.open(file_path, "wb") as buffer:
+                async for chunk in chunks():
+                    await buffer.write(chunk)
+            return
+
+        buffer = await asyncio.to_thread(open, file_path, "wb")
+        try:
+            async for chunk in chunks():
+                await asyncio.to_thread(buffer.write, chunk)
+        finally:
+            await asyncio.to_thread(buffer.close)
+    except HTTPException:
+        await asyncio.to_thread(os.remove, file_path)
+        raise
+
 @app.get("/")
 async def home(request: Request):
     """Main font generator page"""
@@ -39,10 +159,9 @@ async def home(request: Request):
 @app.get("/template-generator")
 async def template_generator_page(request: Request):
     """Template generator page"""
-    character_sets = cli_wrapper.get_character_sets()
     return templates.TemplateResponse("template_generator.html", {
         "request": request,
-        "character_sets": character_sets
+        "character_sets": CHARACTER_SETS
     })
 
 @app.get("/font-test/{font_name}")
@@ -64,20 +183,20 @@ async def generate_template(
     """Generate template with selected characters"""
     try:
         # Parse selected characters
-        selected_chars = json.loads(characters) if characters else []
+        selected_chars = _loads(characters) if characters else []
         
         # Generate unique filename
-        template_id = str(uuid.uuid4())[:8]
+        template_id = secrets.token_hex(4)
         filename = f"{filename}_{template_id}.{format}"
         output_path = f"downloads/{filename}"
         
         # Generate template using CLI
-        result = cli_wrapper.generate_template(output_path, selected_chars)
+        result = await asyncio.to_thread(cli_wrapper.generate_template, output_path, selected_chars)
         
         if not result["success"]:
             raise HTTPException(status_code=500, detail=result.get("error", "Failed to generate template"))
         
-        return JSONResponse({
+        return APIResponse({
             "success": True,
             "svg_file" if format == "svg" else "png_file": filename,
             "svg_url" if format == "svg" else "png_url": f"/downloads/{filename}"
@@ -90,30 +209,46 @@ async def generate_template(
 async def upload_image(file: UploadFile = File(...)):
     """Handle filled template upload"""
     try:
-        # Validate file type
+        # Validate file type, trusting the content rather than the header
         if not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail="File must be an image")
         
+        head = await file.read(12)
+        if not _is_image_header(head):
+            raise HTTPException(status_code=400, detail="File must be an image")
+        
         # Generate unique filename
-        file_id = str(uuid.uuid4())[:8]
+        file_id = secrets.token_hex(4)
         file_extension = Path(file.filename).suffix
         filename = f"template_{file_id}{file_extension}"
         file_path = f"uploads/{filename}"
         
         # Save uploaded file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        await _save_upload(file, file_path, head)
         
-        return JSONResponse({
+        return APIResponse({
             "success": True,
             "file_id": file_id,
             "filename": filename,
             "file_path": file_path
         })
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _iter_svg_files(character_map: Dict):
+    """Yield the svg_files index entries, naming each character once"""
+    char_to_filename = cli_wrapper._char_to_filename
+    for char in character_map:
+        char_name = char_to_filename(char)
+        yield {
+            'character': char,
+            'char_name': char_name,
+            'svg_file': f"{char_name}.svg"
+        }
+
 @app.post("/api/preview")
 async def generate_preview(
     file_path: str = Form(...),
@@ -140,38 +275,49 @@ async def generate_preview(
         }
         
         # Generate font preview using CLI
-        result = cli_wrapper.generate_font_preview(file_path, font_name, settings)
+        result = await cli_wrapper.generate_font_preview_async(file_path, font_name, settings)
         
         if not result["success"]:
             raise HTTPException(status_code=500, detail=result.get("error", "Failed to generate preview"))
         
-        # Convert character map to format expected by frontend
+        # SVG content is sent once, in character_map; svg_files only indexes it
         character_map = result["character_map"]
-        svg_files = []
+        svg_files = _iter_svg_files(character_map)
         
-        for char, char_data in character_map.items():
-            svg_files.append({
-                'character': char,
-                'char_name': cli_wrapper._char_to_filename(char),
-                'svg_content': char_data['svg_content'],
-                'svg_info': char_data['svg_info'],
-                'svg_file': f"{cli_wrapper._char_to_filename(char)}.svg"
-            })
-        
-        return JSONResponse({
+        # Stream the response so the SVG payload is encoded entry by entry
+        return StreamingResponse(_iter_json_object({
             "success": True,
             "svg_dir": result["svg_dir"],
             "svg_files": svg_files,
             "character_map": character_map,
             "font_name": font_name,
             "settings": settings
-        })
+        }), media_type="application/json")
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # Helper functions moved to CLI wrapper
 
+# Scale category per ASCII code point: 0=upper, 1=lower, 2=digit, 3=symbol
+_ASCII_CATEGORIES = bytes(
+    0 if chr(i).isupper() else 1 if chr(i).islower() else 2 if chr(i).isdigit() else 3
+    for i in range(128)
+)
+
+
+def _character_category(char: str) -> int:
+    """Return the scale category of a character (0=upper, 1=lower, 2=digit, 3=symbol)"""
+    if len(char) == 1 and char < '\x80':
+        return _ASCII_CATEGORIES[ord(char)]
+    if char.isupper():
+        return 0
+    if char.islower():
+        return 1
+    if char.isdigit():
+        return 2
+    return 3
+
 @app.post("/api/update-preview")
 async def update_preview_settings(
     character_map: dict,
@@ -186,29 +332,15 @@ async def update_preview_settings(
     """Update preview settings without regenerating SVGs"""
     try:
         # Update character scaling based on new settings
-        updated_character_map = {}
+        scales = (uppercase_scale, lowercase_scale, numbers_scale, symbols_scale)
         
         for char, char_data in character_map.items():
             # Determine character type and apply appropriate scaling
-            scale_factor = 3.0  # Default
-            
-            if char.isupper():
-                scale_factor = uppercase_scale
-            elif char.islower():
-                scale_factor = lowercase_scale
-            elif char.isdigit():
-                scale_factor = numbers_scale
-            else:
-                scale_factor = symbols_scale
-            
-            updated_character_map[char] = {
-                **char_data,
-                'scale_factor': scale_factor
-            }
+            char_data['scale_factor'] = scales[_character_category(char)]
         
-        return JSONResponse({
+        return APIResponse({
             "success": True,
-            "character_map": updated_character_map,
+            "character_map": character_map,
             "settings": {
                 'uppercase_scale': uppercase_scale,
                 'lowercase_scale': lowercase_scale,
@@ -235,18 +367,18 @@ async def generate_final_font(
         customizations_dict = None
         if character_customizations:
             try:
-                customizations_dict = json.loads(character_customizations)
+                customizations_dict = _loads(character_customizations)
                 print(f"Received character customizations: {customizations_dict}")
             except json.JSONDecodeError as e:
                 print(f"Error parsing character customizations: {e}")
         
         # Generate final TTF font using CLI
-        font_path = cli_wrapper.generate_final_font(original_image_path, font_name, customizations_dict)
+        font_path = await cli_wrapper.generate_final_font_async(original_image_path, font_name, customizations_dict)
         
         if not font_path:
             raise HTTPException(status_code=500, detail="Failed to generate font")
         
-        return JSONResponse({
+        return APIResponse({
             "success": True,
             "font_file": f"{font_name}.ttf",
             "font_url": f"/{font_path}",
@@ -263,24 +395,23 @@ async def generate_temp_font(
 ):
     """Generate temporary TTF font for testing"""
     try:
-        import uuid
-        temp_name = f"temp_{str(uuid.uuid4())[:8]}"
+        temp_name = f"temp_{secrets.token_hex(4)}"
         
         # Parse character customizations if provided
         customizations_dict = None
         if character_customizations:
             try:
-                customizations_dict = json.loads(character_customizations)
+                customizations_dict = _loads(character_customizations)
             except json.JSONDecodeError as e:
                 print(f"Error parsing character customizations: {e}")
         
         # Generate temporary TTF font using CLI
-        font_path = cli_wrapper.generate_final_font(original_image_path, temp_name, customizations_dict)
+        font_path = await cli_wrapper.generate_final_font_async(original_image_path, temp_name, customizations_dict)
         
         if not font_path:
             raise HTTPException(status_code=500, detail="Failed to generate temp font")
         
-        return JSONResponse({
+        return APIResponse({
             "success": True,
             "temp_font_name": temp_name,
             "font_url": f"/{font_path}",
@@ -293,14 +424,15 @@ async def generate_temp_font(
 @app.get("/api/config")
 async def get_config():
     """Get current configuration"""
-    return JSONResponse(cli_wrapper.config)
+    cli_wrapper._refresh_config()
+    return APIResponse(cli_wrapper.config)
 
 @app.post("/api/config")
 async def update_config(settings: Dict):
     """Update configuration"""
     try:
         cli_wrapper._update_cli_config(settings)
-        return JSONResponse({"success": True, "config": cli_wrapper.config})
+        return APIResponse({"success": True, "config": cli_wrapper.config})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -320,6 +452,63 @@ async def get_example_template():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error serving example template: {str(e)}")
 
+# Example SVG payload, rebuilt only when the example directory changes
+_example_svgs_cache = {}
+
+
+def _example_svgs_stamp(svg_dir: Path):
+    """Return a key that changes whenever an example SVG is added, removed or edited"""
+    mtimes = [entry.stat().st_mtime_ns for entry in os.scandir(svg_dir)
+              if entry.name.endswith('.svg')]
+    return (str(svg_dir), svg_dir.stat().st_mtime_ns, len(mtimes), max(mtimes, default=0))
+
+
+async def _load_example_svgs(svg_dir: Path) -> Dict:
+    """Build the example character map payload, reusing it while the files are unchanged"""
+    stamp = await asyncio.to_thread(_example_svgs_stamp, svg_dir)
+    cached = _example_svgs_cache.get('payload')
+    if cached and _example_svgs_cache.get('stamp') == stamp:
+        return cached
+    
+    # Convert filenames to characters (e.g., "0048.svg" -> "0")
+    svg_files = [svg_file for svg_file in svg_dir.glob("*.svg") if svg_file.stem.isdigit()]
+    
+    # Read all SVG files concurrently off the event loop
+    contents = await asyncio.gather(
+        *(asyncio.to_thread(svg_file.read_bytes) for svg_file in svg_files),
+        return_exceptions=True
+    )
+    
+    # Load all SVG files and create character map
+    character_map = {}
+    
+    for svg_file, svg_content in zip(svg_files, contents):
+        if isinstance(svg_content, Exception):
+            print(f"Error processing {svg_file}: {svg_content}")
+            continue
+        
+        filename = svg_file.stem  # Gets "0048" from "0048.svg"
+        try:
+            char = chr(int(filename))
+            svg_content = svg_content.decode('utf-8')
+        except Exception as e:
+            print(f"Error processing {svg_file}: {e}")
+            continue
+        character_map[char] = {
+            "svg_content": svg_content,
+            "filename": filename
+        }
+    
+    payload = {
+        "success": True,
+        "character_map": character_map,
+        "total_characters": len(character_map),
+        "original_image_path": str(Path("uploads/template_6e6e49e9.png"))
+    }
+    _example_svgs_cache['stamp'] = stamp
+    _example_svgs_cache['payload'] = payload
+    return payload
+
 @app.get("/api/example-svgs")
 async def get_example_svgs():
     """Serve the pre-generated SVG data for the example font"""
@@ -328,38 +517,20 @@ async def get_example_svgs():
         if not svg_dir.exists():
             raise HTTPException(status_code=404, detail="Example SVG directory not found")
         
-        # Load all SVG files and create character map
-        character_map = {}
-        
-        for svg_file in svg_dir.glob("*.svg"):
-            try:
-                # Read SVG content
-                with open(svg_file, 'r') as f:
-                    svg_content = f.read()
-                
-                # Convert filename to character (e.g., "0048.svg" -> "0")
-                filename = svg_file.stem  # Gets "0048" from "0048.svg"
-                if filename.isdigit():
-                    char = chr(int(filename))
-                    character_map[char] = {
-                        "svg_content": svg_content,
-                        "filename": filename
-                    }
-                    
-            except Exception as e:
-                print(f"Error processing {svg_file}: {e}")
-                continue
-        
-        return JSONResponse({
-            "success": True,
-            "character_map": character_map,
-            "total_characters": len(character_map),
-            "original_image_path": str(Path("uploads/template_6e6e49e9.png"))
-        })
+        return APIResponse(await _load_example_svgs(svg_dir))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading example SVGs: {str(e)}")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
\ No newline at end of file
+    # FONTGEN_WORKERS=N opts into N worker processes; the default stays a
+    # single auto-reloading process for development
+    workers = int(os.getenv("FONTGEN_WORKERS", "1"))
+    if workers > 1:
+        # uvicorn picks uvloop and httptools automatically when installed
+        uvicorn.run("main:app", host="127.0.0.1", port=8000,
+                    workers=workers, loop="auto", http="auto",
+                    limit_concurrency=1000, backlog=2048)
+    else:
+        uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
\ No newline at end of file
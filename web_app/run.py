@@ -7,6 +7,19 @@ import uvicorn
 import sys
 import os
 
+# uvloop and httptools ship with uvicorn[standard]; fall back to asyncio/h11
+try:
+    import uvloop  # noqa: F401
+    LOOP = "uvloop"
+except ImportError:
+    LOOP = "asyncio"
+
+try:
+    import httptools  # noqa: F401
+    HTTP = "httptools"
+except ImportError:
+    HTTP = "h11"
+
 # Add the project root to Python path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -14,11 +27,15 @@ if __name__ == "__main__":
     # Check if running in production mode
     is_prod = os.getenv("isProd", "false").lower() == "true"
     host = "0.0.0.0" if is_prod else "127.0.0.1"
+    # One worker process per core in production; reload needs a single worker
+    workers = (os.cpu_count() or 1) if is_prod else 1
     
     print("🚀 Starting FontGen Web UI...")
     print(f"📍 Navigate to: http://localhost:8000")
     print(f"🔧 Mode: {'Production' if is_prod else 'Development'}")
     print(f"🌐 Host: {host}")
+    print(f"👷 Workers: {workers}")
+    print(f"⚡ Event loop: {LOOP}, HTTP parser: {HTTP}")
     print("🛑 Press Ctrl+C to stop")
     print("-" * 50)
     
@@ -27,5 +44,8 @@ if __name__ == "__main__":
         host=host,
         port=8000,
         reload=not is_prod,  # Disable reload in production
+        workers=workers,
+        loop=LOOP,
+        http=HTTP,
         log_level="info"
     )
\ No newline at end of file